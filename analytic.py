@@ -0,0 +1,182 @@
+from math import sin, cos, asin, acos, atan, sqrt, pi, degrees
+
+from formulas import *
+
+
+def vmx_v0_a_t_angle(vmx, v0, t, g) -> list:
+    """ Решения формулы vmx_v0_a_t для угла (через тангенс половинного угла) """
+
+    root = sqrt(((g * t + v0) ** 2 - vmx ** 2) * (vmx ** 2 - (g * t - v0) ** 2))
+    denominator = (g * t) ** 2 + v0 ** 2 - vmx ** 2
+    return [2 * atan((2 * g * t * v0 - root) / denominator),
+            2 * atan((2 * g * t * v0 + root) / denominator)]
+
+
+# Выведенные вручную решения каждой формулы для каждой переменной.
+# Ветви перечислены в том же порядке, что и в Formula.solve, аргументы - в порядке
+# Formula.arguments (остальные переменные формулы и g), углы - в радианах
+BRANCHES = {
+    (h_v0_a, h): lambda v0, a, y0, g: [y0 + (v0 * sin(a)) ** 2 / (2 * g)],
+    (h_v0_a, v0): lambda h, a, y0, g: [-sqrt(2 * g * (h - y0)) / sin(a),
+                                       sqrt(2 * g * (h - y0)) / sin(a)],
+    (h_v0_a, a): lambda h, v0, y0, g: [pi - asin(sqrt(2 * g * (h - y0)) / v0),
+                                       asin(sqrt(2 * g * (h - y0)) / v0) + pi,
+                                       -asin(sqrt(2 * g * (h - y0)) / v0),
+                                       asin(sqrt(2 * g * (h - y0)) / v0)],
+    (h_v0_a, y0): lambda h, v0, a, g: [h - (v0 * sin(a)) ** 2 / (2 * g)],
+
+    (s_v0_a_y00, s): lambda v0, a, g: [v0 ** 2 * sin(2 * a) / g],
+    (s_v0_a_y00, v0): lambda s, a, g: [-sqrt(g * s / sin(2 * a)), sqrt(g * s / sin(2 * a))],
+    (s_v0_a_y00, a): lambda s, v0, g: [pi / 2 - asin(g * s / v0 ** 2) / 2,
+                                       asin(g * s / v0 ** 2) / 2],
+
+    (s_v0_a_t, s): lambda v0, a, t, g: [v0 * cos(a) * t],
+    (s_v0_a_t, v0): lambda s, a, t, g: [s / (t * cos(a))],
+    (s_v0_a_t, a): lambda s, v0, t, g: [2 * pi - acos(s / (t * v0)), acos(s / (t * v0))],
+    (s_v0_a_t, t): lambda s, v0, a, g: [s / (v0 * cos(a))],
+
+    (vmx_v0_y00, vmx): lambda v0, g: [v0],
+    (vmx_v0_y00, v0): lambda vmx, g: [vmx],
+
+    (vmx_v0_a_t, vmx): lambda v0, a, t, g: [sqrt((v0 * cos(a)) ** 2 + (v0 * sin(a) - g * t) ** 2)],
+    (vmx_v0_a_t, v0): lambda vmx, a, t, g: [
+        g * t * sin(a) - sqrt(vmx ** 2 - (g * t * cos(a)) ** 2),
+        g * t * sin(a) + sqrt(vmx ** 2 - (g * t * cos(a)) ** 2)
+    ],
+    (vmx_v0_a_t, a): vmx_v0_a_t_angle,
+    (vmx_v0_a_t, t): lambda vmx, v0, a, g: [
+        (v0 * sin(a) - sqrt(vmx ** 2 - (v0 * cos(a)) ** 2)) / g,
+        (v0 * sin(a) + sqrt(vmx ** 2 - (v0 * cos(a)) ** 2)) / g
+    ],
+
+    (vmn_v0_a, vmn): lambda v0, a, g: [v0 * cos(a)],
+    (vmn_v0_a, v0): lambda vmn, a, g: [vmn / cos(a)],
+    (vmn_v0_a, a): lambda vmn, v0, g: [2 * pi - acos(vmn / v0), acos(vmn / v0)],
+
+    (tu_v0_a, tu): lambda v0, a, g: [v0 * sin(a) / g],
+    (tu_v0_a, v0): lambda tu, a, g: [g * tu / sin(a)],
+    (tu_v0_a, a): lambda tu, v0, g: [pi - asin(g * tu / v0), asin(g * tu / v0)],
+
+    (td_h, td): lambda h, g: [sqrt(2 * h / g)],
+    (td_h, h): lambda td, g: [g * td ** 2 / 2],
+
+    (t_tu_td, t): lambda tu, td, g: [tu + td],
+    (t_tu_td, tu): lambda t, td, g: [t - td],
+    (t_tu_td, td): lambda t, tu, g: [t - tu],
+}
+ARGUMENTS = {(formula, var): formula.arguments(var) for formula, var in BRANCHES}
+#
+
+
+def calc(formula: Formula, target_variable: Symbol, values: dict) -> (float, int):
+    """
+    Функция рассчитывает значение целевой переменной по выведенным вручную решениям,
+    выбирая ветвь по тем же правилам, что и Formula.calc
+    :param formula: Формула
+    :param target_variable: Целевая переменная
+    :param values: Словарь значений остальных переменных формулы и g (углы в радианах)
+    :return: Кортеж из значения и номера выбранной ветви (см. Formula.solve)
+    """
+
+    arguments = [values[var] for var in ARGUMENTS[(formula, target_variable)]]
+    for rejected, reason in formula.check_domain(target_variable, arguments):
+        if rejected:  # Текст ошибки формирует символьный путь
+            raise ValueError(f'{reason.strip()}: {target_variable}')
+
+    # Ветви одной формулы имеют общую область определения, поэтому вне ее недействительны все
+    try:
+        branches = BRANCHES[(formula, target_variable)](*arguments)
+    except (ValueError, ZeroDivisionError, OverflowError):
+        raise ValueError(f'No real solution for {target_variable}')
+    #
+
+    if formula is vmx_v0_a_t and target_variable is v0:
+        if not formula.check_roots(target_variable, arguments, branches[1]):
+            raise ValueError(f'No real solution for {target_variable}')
+        return branches[1], 1
+    solve = [(value, index) for index, value in enumerate(branches)
+             if formula.check_roots(target_variable, arguments, value)]  # Без посторонних корней
+    if not solve:
+        raise ValueError(f'No real solution for {target_variable}')
+
+    if target_variable.is_angle:  # Наименьший угол из промежутка [0; 90]
+        angles = sorted(branch for branch in solve if 0 <= branch[0] <= pi / 2)
+        if not angles or angles[0][0] == 0:
+            raise ValueError(f'Incorrect angle {target_variable}')
+        return degrees(angles[0][0]), angles[0][1]
+
+    if target_variable is y0 and solve[0][0] < 10 ** -10:  # Уточнение результата для y0
+        if solve[0][0] < -1:
+            raise ValueError(f'Negative result for {target_variable}')
+        return 0.0, solve[0][1]
+
+    if target_variable in time_variables:  # Положительный корень для времени
+        index = choose_time_root([value for value, _ in solve])
+        if index is None:
+            raise ValueError(f'Negative result for {target_variable}')
+        return solve[index]
+
+    positive_index = 0 if solve[0][0] >= 0 else 1
+    if positive_index >= len(solve):
+        raise ValueError(f'Negative result for {target_variable}')
+    return solve[positive_index]
+
+
+def find_fast(known_values: dict, targets=None, context=None, with_formulas=False) -> (dict, dict):
+    """
+    Функция осуществляет поиск значений переменных по выведенным вручную решениям, не используя
+    sympy. Результат совпадает с find(); если план решения содержит формулу без выведенного
+    решения или при расчете возникает ошибка, расчет выполняется символьным путем (find)
+    :param known_values: Словарь известных значений (передаваемый словарь будет изменяться)
+    :param targets: Коллекция искомых переменных (см. find)
+    :param context: Контекст решения (по умолчанию SolverContext.current())
+    :param with_formulas: Возвращать ли формулы найденных величин (берутся из Formula.solve)
+    :return: Возвращает кортеж 2-х словарей: словарь известных теперь значений и словарь формул
+             (пустой, если with_formulas=False)
+    """
+
+    context = context or SolverContext.current()
+
+    # Поиск решения в кэше в памяти (отдельные от find() ключи: значения могут отличаться
+    # в последних знаках)
+    key = solution_key(known_values, targets, context)
+    if key is not None:
+        key += ('find_fast', with_formulas)
+        solution = find_cache.get(key)
+        if solution is not None:
+            for var, value in solution[0].items():
+                known_values.setdefault(var, value)
+            return known_values, solution[1]
+    #
+
+    plan = get_plan(known_values, targets, context)
+    if not all(step in BRANCHES for step in plan):  # Набор не покрыт выведенными решениями
+        return find(known_values, targets=targets, context=context)
+
+    values = {var: var.get_value(value) for var, value in known_values.items()}
+    values[g] = context.g
+    if context.y0_known and y0 not in values:
+        values[y0] = y0_const
+
+    # Расчет по плану решения
+    found = {}
+    try:
+        for formula, var in plan:
+            value, index = calc(formula, var, values)
+            values[var] = var.get_value(value)
+            found[var] = (value, formula, index)
+    except ValueError:  # Ошибку (и ее текст) формирует символьный путь
+        return find(known_values, targets=targets, context=context)
+    #
+
+    variable_formula = {}
+    if context.y0_known and y0 not in known_values:
+        known_values[y0] = y0_const
+    for var, (value, formula, index) in found.items():
+        known_values[var] = value
+        if with_formulas and (targets is None or var in targets):
+            variable_formula[var] = formula.solve(var)[index]
+
+    if key is not None:
+        find_cache.put(key, known_values, variable_formula)
+    return known_values, variable_formula
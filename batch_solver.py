@@ -0,0 +1,118 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from math import ceil
+from time import time
+import os
+
+from formulas import *
+from analytic import find_fast
+
+
+name_to_variable = {str(var): var for var in all_variables}
+worker_context = None  # Контекст решения процесса-обработчика (задается в warm_up)
+
+
+def warm_up(y0_known: bool, g_value, steps: list):
+    """
+    Функция подготавливает процесс-обработчик: создает контекст решения и заранее
+    решает (и компилирует) формулы, которые понадобятся для расчетов
+    :param y0_known: Известность y0
+    :param g_value: Ускорение свободного падения
+    :param steps: Список пар (индекс формулы в наборе контекста, имя искомой переменной)
+    """
+
+    global worker_context
+    worker_context = SolverContext(y0_known, g_value)
+
+    for index, var in steps:
+        worker_context.formulas[index].compile(name_to_variable[var])
+
+
+@lru_cache(maxsize=None)
+def formula_text(formula) -> str:
+    """ Функция возвращает текст формулы (печать выражений sympy медленная, поэтому кэшируется) """
+
+    return str(formula)
+
+
+def solve_chunk(chunk: list, numeric: bool) -> list:
+    """
+    Функция решает часть бросков в процессе-обработчике
+    :param chunk: Список словарей известных значений вида <Имя переменной> = <Значение>
+    :param numeric: Использовать ли быстрый численный путь (analytic.find_fast)
+    :return: Список кортежей (значения, формулы, ошибка) с именами переменных в качестве ключей
+    """
+
+    results = []
+    for known in chunk:
+        try:
+            known = {name_to_variable[var]: value for var, value in known.items()}
+            if numeric:
+                values, formulas = find_fast(known, context=worker_context, with_formulas=True)
+            else:
+                values, formulas = find(known, context=worker_context)
+            results.append(({str(var): float(value) for var, value in values.items()},
+                            {str(var): formula_text(formula) for var, formula in formulas.items()},
+                            None))
+        except (ValueError, TypeError, IndexError) as error:
+            results.append((None, None, str(error)))
+    return results
+
+
+def solve_many(items: list, y0_known=True, g_value=None, numeric=False, workers=None,
+               chunk_size=None) -> (list, dict):
+    """
+    Функция решает множество бросков, распределяя их по процессам
+    :param items: Список словарей известных значений (как для find)
+    :param y0_known: Известность y0
+    :param g_value: Ускорение свободного падения (по умолчанию текущее из CONSTANTS)
+    :param numeric: Использовать ли быстрый численный путь (analytic.find_fast)
+    :param workers: Количество процессов (по умолчанию количество ядер)
+    :param chunk_size: Количество бросков, отправляемых процессу за раз
+    :return: Кортеж из списка результатов в порядке items и словаря статистики.
+             Результат - кортеж (значения, формулы, ошибка); при ошибке значения и формулы None
+    """
+
+    start = time()
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, ceil(len(items) / (workers * 4)))
+    context = SolverContext(y0_known, CONSTANTS['g'] if g_value is None else g_value)
+
+    # Формулы, которые понадобятся для расчетов (решаются в каждом процессе один раз)
+    steps = set()
+    for known in items:
+        for formula, var in get_plan(known, context=context):
+            steps.add((context.formulas.index(formula), str(var)))
+    #
+
+    named_items = [{str(var): value for var, value in known.items()} for known in items]
+    chunks = [named_items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+    results = []
+    with ProcessPoolExecutor(workers, initializer=warm_up,
+                             initargs=(context.y0_known, context.g, sorted(steps))) as executor:
+        for chunk_results in executor.map(solve_chunk, chunks, [numeric] * len(chunks)):
+            for values, formulas, error in chunk_results:
+                if error is not None:
+                    results.append((None, None, error))
+                    continue
+                values = {name_to_variable[var]: value for var, value in values.items()}
+                formulas = {name_to_variable[var]: formula for var, formula in formulas.items()}
+                results.append((values, formulas, None))
+
+    seconds = time() - start
+    statistics = {
+        'items': len(items), 'errors': sum(error is not None for *_, error in results),
+        'workers': workers, 'chunk_size': chunk_size, 'seconds': seconds,
+        'items_per_second': len(items) / seconds if seconds else float('inf')
+    }
+
+    return results, statistics
+
+
+if __name__ == '__main__':
+    import random
+
+    shots = [{v0: random.uniform(1, 100), a: random.uniform(1, 89)} for _ in range(10_000)]
+    _, stats = solve_many(shots, numeric=True)
+    print(stats)
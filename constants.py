@@ -1,4 +1,4 @@
-from database_requests import get_data_from_db
+from database_requests import get_settings_from_db
 
 DATA_DIR = "resources"
 MY_DB = f"{DATA_DIR}/database/results.db"
@@ -6,15 +6,23 @@ MY_DB = f"{DATA_DIR}/database/results.db"
 CONSTANTS = {
     'g': 10,
     'graph_time_ms': 2_000,
-    'is_animated': 1
+    'is_animated': 1,
+    'numeric_tolerance': 10 ** -9,
+    'root_tolerance': 10 ** -6,  # Относительная погрешность проверки корней и нуля времени
+    'memo_precision': 6,  # Знаков после запятой в ключах кэшей решений
+    'memo_size': 10_000,  # Наибольшее количество бросков в постоянном кэше
+    'cache_size': 1_024,  # Наибольшее количество бросков в кэше find() в памяти
+    'solve_timeout': 2  # Время (в секундах) на символьное решение формулы для переменной
 }
 
 y0_const = 0
 delete_char = chr(10_005)
+constants_listeners = []  # Функции, вызываемые после обновления констант (сброс кэшей)
 
 
 def update_constants():
     """ Обновление глобального словаря констант """
 
-    for param, value in get_data_from_db(MY_DB, 'settings', 'param, value'):
-        CONSTANTS[param] = value
+    CONSTANTS.update(get_settings_from_db(MY_DB))
+    for listener in constants_listeners:
+        listener()
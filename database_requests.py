@@ -1,4 +1,365 @@
+from contextlib import contextmanager
+import itertools as it
+import atexit
+import os
+import queue
 import sqlite3
+import sys
+import threading
+from time import monotonic, perf_counter
+
+
+# Журнал запросов (включается переменной окружения DB_QUERY_LOG: 1 - вывод в stderr,
+# иначе - путь к файлу журнала) и сводка по самым медленным и частым запросам
+query_log = os.environ.get('DB_QUERY_LOG', '0') not in ('', '0')
+query_log_file = os.environ.get('DB_QUERY_LOG') if query_log else None
+query_statistics = {}  # <Вид запроса> = [количество, общее время, наибольшее время, строки]
+_statistics_lock = threading.Lock()
+
+
+def set_query_logging(enabled: bool, file=None) -> None:
+    """
+    Функция включает или выключает журнал запросов
+    :param enabled: Вести ли журнал
+    :param file: Путь к файлу журнала (по умолчанию stderr)
+    """
+
+    global query_log, query_log_file
+    query_log, query_log_file = enabled, file
+
+
+def run_query(con: sqlite3.Connection, request: str, params=(), many=False, fetch=False):
+    """
+    Функция выполняет запрос; при включенном журнале записывает его вид, параметры,
+    количество строк и время выполнения и учитывает запрос в сводке
+    :param con: Соединение
+    :param request: Запрос
+    :param params: Параметры (для many - список наборов параметров)
+    :param many: Выполнить запрос для каждого набора параметров (executemany)
+    :param fetch: Вернуть выбранные строки
+    :return: Список строк, если fetch, иначе курсор
+    """
+
+    if not query_log:
+        cursor = con.executemany(request, params) if many else con.execute(request, params)
+        return cursor.fetchall() if fetch else cursor
+
+    start = perf_counter()
+    cursor = con.executemany(request, params) if many else con.execute(request, params)
+    result = cursor.fetchall() if fetch else cursor
+    seconds = perf_counter() - start
+    rows = len(result) if fetch else max(cursor.rowcount, 0)
+
+    with _statistics_lock:
+        statistics = query_statistics.setdefault(request, [0, 0.0, 0.0, 0])
+        statistics[0] += 1
+        statistics[1] += seconds
+        statistics[2] = max(statistics[2], seconds)
+        statistics[3] += rows
+
+    if many:
+        params = list(params)
+        params = f'{len(params)} наборов, первый {params[0] if params else None}'
+    write_query_log(f'{seconds * 1_000:8.3f} мс {rows:6} строк | {request} | {params}')
+    return result
+
+
+def write_query_log(line: str) -> None:
+    """ Функция записывает строку в журнал запросов """
+
+    if query_log_file in (None, '1'):
+        print(line, file=sys.stderr)
+        return
+    with open(query_log_file, mode='a', encoding='utf-8') as file:
+        file.write(line + '\n')
+
+
+def get_query_summary(top=10) -> dict:
+    """
+    Функция возвращает сводку журнала запросов
+    :param top: Количество запросов в каждом списке
+    :return: Словарь со списками 'slowest' (по наибольшему времени) и 'most_frequent'
+             (по количеству) кортежей (запрос, количество, общее время, наибольшее время, строки)
+    """
+
+    with _statistics_lock:
+        items = [(request, *statistics) for request, statistics in query_statistics.items()]
+    return {'slowest': sorted(items, key=lambda item: item[3], reverse=True)[:top],
+            'most_frequent': sorted(items, key=lambda item: item[1], reverse=True)[:top]}
+
+
+def dump_query_summary(top=10) -> None:
+    """ Функция выводит сводку журнала запросов (см. get_query_summary) в журнал """
+
+    summary = get_query_summary(top)
+    for title, key in (('Самые медленные запросы', 'slowest'),
+                       ('Самые частые запросы', 'most_frequent')):
+        write_query_log(f'{title}:')
+        for request, count, total, longest, rows in summary[key]:
+            write_query_log(f'{count:8} раз {total * 1_000:10.3f} мс всего '
+                            f'{longest * 1_000:8.3f} мс макс. {rows:8} строк | {request}')
+
+
+@atexit.register
+def dump_query_summary_on_exit() -> None:
+    """ Функция выводит сводку при выходе, если журнал включен """
+
+    if query_log and query_statistics:
+        dump_query_summary()
+#
+
+
+# Менеджер соединений: одно соединение на поток для каждой базы данных
+PRAGMAS = {
+    'journal_mode': 'WAL',  # Читатели не блокируют писателя и наоборот
+    'synchronous': 'NORMAL',  # В режиме WAL достаточно для сохранности при сбое приложения
+    'foreign_keys': 'ON',
+    'busy_timeout': 5_000,  # Ожидание блокировки другим соединением (мс)
+    'temp_store': 'MEMORY'
+}
+CACHED_STATEMENTS = 256
+
+_local = threading.local()  # Соединения и глубина транзакций текущего потока
+_all_connections = []  # Все открытые соединения (закрываются при выходе)
+_connections_lock = threading.Lock()
+
+
+def get_connection(db: str) -> sqlite3.Connection:
+    """
+    Функция возвращает соединение текущего потока с базой данных, при первом обращении
+    открывая его и настраивая (PRAGMAS). Соединение работает в режиме автофиксации:
+    транзакции задаются явно через transaction()
+    :param db: Используемая база данных
+    :return: Соединение
+    """
+
+    path = os.path.abspath(db)
+    connections = _local.__dict__.setdefault('connections', {})
+    if path not in connections:
+        con = sqlite3.connect(path, isolation_level=None, cached_statements=CACHED_STATEMENTS)
+        for pragma, value in PRAGMAS.items():
+            run_query(con, f"PRAGMA {pragma} = {value}")
+
+        connections[path] = con
+        with _connections_lock:
+            _all_connections.append(con)
+    return connections[path]
+
+
+@contextmanager
+def transaction(db: str):
+    """
+    Контекстный менеджер транзакции: все записи внутри блока фиксируются одним COMMIT
+    либо откатываются при исключении. Вложенные блоки присоединяются к внешней транзакции
+    :param db: Используемая база данных
+    :return: Соединение (через as)
+    """
+
+    con = get_connection(db)
+    depths = _local.__dict__.setdefault('depths', {})
+    path = os.path.abspath(db)
+
+    if depths.get(path, 0):  # Уже внутри транзакции
+        depths[path] += 1
+        try:
+            yield con
+        finally:
+            depths[path] -= 1
+        return
+
+    run_query(con, "BEGIN")
+    depths[path] = 1
+    try:
+        yield con
+    except BaseException:
+        run_query(con, "ROLLBACK")
+        raise
+    else:
+        run_query(con, "COMMIT")
+    finally:
+        depths[path] = 0
+
+
+@atexit.register
+def close_connections() -> None:
+    """ Функция закрывает все открытые соединения (вызывается при выходе) """
+
+    with _connections_lock:
+        for con in _all_connections:
+            try:
+                con.close()
+            except sqlite3.ProgrammingError:  # Соединение другого потока
+                pass
+        _all_connections.clear()
+    _local.__dict__.pop('connections', None)
+
+
+def close_thread_connections() -> None:
+    """ Функция закрывает соединения текущего потока (вызывается потоком перед завершением) """
+
+    for con in _local.__dict__.pop('connections', {}).values():
+        with _connections_lock:
+            if con in _all_connections:
+                _all_connections.remove(con)
+        con.close()
+#
+
+
+
+# Построитель запросов: значения передаются через плейсхолдеры ?, поэтому запросы одинакового
+# вида имеют одинаковый текст и берутся из кэша подготовленных выражений соединения
+def placeholders(count: int) -> str:
+    """ Функция возвращает строку из count плейсхолдеров через запятую """
+
+    return ', '.join('?' * count)
+
+
+def parameter(value):
+    """ Функция приводит значение к типу, который может быть передан в запрос """
+
+    return value if value is None or isinstance(value, (int, float, str, bytes)) else str(value)
+
+
+def build_conditions(conditions: dict, operator: str, joiner=' AND ', not_fl=False) -> (str, list):
+    """
+    Функция строит условие запроса из словаря условий
+    :param conditions: Словарь условий вида: <Ключ> = <Значение> (для IN - коллекция значений)
+    :param operator: Оператор сравнения ('=', 'LIKE' или 'IN')
+    :param joiner: Связка условий
+    :param not_fl: Нужно ли добавлять NOT перед оператором сравнения
+    :return: Кортеж из текста условия и списка параметров
+    """
+
+    parts, params = [], []
+    for column, value in conditions.items():
+        if operator == 'IN':  # Список значений любой длины
+            value = [parameter(item) for item in value]
+            parts.append(f"{column}{' NOT' if not_fl else ''} IN ({placeholders(len(value))})")
+            params += value
+        else:
+            parts.append(f"{column}{' NOT' if not_fl else ''} {operator} ?")
+            params.append(parameter(value))
+    return joiner.join(parts), params
+
+
+def insert_request(table: str, columns: (list, tuple), values: (list, tuple)) -> (str, list):
+    """ Функция возвращает запрос вставки строки и его параметры (см. add_data_to_db) """
+
+    request = f"INSERT INTO {table}({', '.join(columns)}) VALUES ({placeholders(len(columns))})"
+    return request, [parameter(value) for value in values]
+
+
+def update_request(table: str, update_data: dict, conditions: dict) -> (str, list):
+    """ Функция возвращает запрос обновления строк и его параметры (см. update_data_in_db) """
+
+    assignments, params = build_conditions(update_data, '=', joiner=', ')
+    request = f"UPDATE {table} SET {assignments}"
+    if conditions:
+        where, where_params = build_conditions(conditions, '=')
+        request += f" WHERE {where}"
+        params += where_params
+    return request, params
+
+
+def delete_request(table: str, conditions: dict, not_fl=False) -> (str, list):
+    """ Функция возвращает запрос удаления строк и его параметры (см. delete_data_from_db) """
+
+    request = f"DELETE FROM {table}"
+    params = []
+    if conditions:
+        where, params = build_conditions(conditions, 'IN', not_fl=not_fl)
+        request += f" WHERE {where}"
+    return request, params
+
+
+def execute_requests(con: sqlite3.Connection, requests) -> int:
+    """
+    Функция выполняет запросы, объединяя идущие подряд запросы одинакового вида в executemany
+    :param con: Соединение (запросы выполняются в уже открытой транзакции)
+    :param requests: Итерируемый объект пар (запрос, параметры)
+    :return: Количество выполненных запросов
+    """
+
+    count = 0
+    for request, group in it.groupby(requests, key=lambda item: item[0]):
+        params = [item[1] for item in group]
+        run_query(con, request, params, many=True)
+        count += len(params)
+    return count
+#
+
+
+# Кэш таблиц, которые не меняются во время работы приложения (settings, variables_collections):
+# таблица загружается один раз, а записи через функции этого модуля сбрасывают ее кэш
+_table_cache = {}  # <(Путь к базе данных, Таблица)> = <Индексированное содержимое>
+_cache_lock = threading.Lock()
+
+
+def cached_table(db: str, table: str, load):
+    """
+    Функция возвращает содержимое таблицы из кэша, загружая его при первом обращении
+    :param db: Используемая база данных
+    :param table: Таблица
+    :param load: Функция загрузки содержимого (принимает db)
+    :return: Индексированное содержимое таблицы
+    """
+
+    key = (os.path.abspath(db), table)
+    with _cache_lock:
+        if key in _table_cache:
+            return _table_cache[key]
+
+    content = load(db)
+    with _cache_lock:
+        return _table_cache.setdefault(key, content)
+
+
+def invalidate_cache(db=None, table=None) -> None:
+    """
+    Функция сбрасывает кэш таблиц
+    :param db: База данных (по умолчанию все)
+    :param table: Таблица (по умолчанию все таблицы базы данных)
+    """
+
+    path = None if db is None else os.path.abspath(db)
+    with _cache_lock:
+        for key in list(_table_cache):
+            if (path is None or key[0] == path) and (table is None or key[1] == table):
+                del _table_cache[key]
+
+
+def get_settings_from_db(db: str) -> dict:
+    """
+    Функция возвращает настройки (таблица settings) из кэша
+    :param db: Используемая база данных
+    :return: Словарь вида <Параметр> = <Значение> (копия)
+    """
+
+    settings = cached_table(db, 'settings', lambda db_path: dict(
+        get_data_from_db(db_path, 'settings', 'param, value')))
+    return dict(settings)
+
+
+def get_collections_from_db(db: str, variable: str, is_known: int) -> list:
+    """
+    Функция возвращает наборы переменных для поиска переменной (таблица variables_collections)
+    из кэша, индексированного по (variable, is_known)
+    :param db: Используемая база данных
+    :param variable: Имя искомой переменной
+    :param is_known: Известность y0 (0 или 1)
+    :return: Список строк required_values в порядке таблицы (копия)
+    """
+
+    def load(db_path: str) -> dict:
+        index = {}
+        for row_variable, required_values, row_is_known in get_data_from_db(
+                db_path, 'variables_collections', 'variable, required_values, is_known',
+                ordering={'id': 0}):
+            index.setdefault((row_variable, int(row_is_known)), []).append(required_values)
+        return index
+
+    return list(cached_table(db, 'variables_collections', load).get((variable, int(is_known)), []))
+#
 
 
 def add_data_to_db(db: str, table: str, columns: (list, tuple), values: (list, tuple)) -> None:
@@ -10,17 +371,11 @@ def add_data_to_db(db: str, table: str, columns: (list, tuple), values: (list, t
     :return: None
     """
 
-    con = sqlite3.connect(db)
-    cur = con.cursor()
-
-    request = f"""INSERT INTO {table}({', '.join(columns)}) VALUES 
-                  ('{"', '".join(str(var) for var in values)}')"""
-    print(request)
-    cur.execute(request)
+    request, params = insert_request(table, columns, values)
 
-    con.commit()
-    con.close()
-    print('added')
+    with transaction(db) as con:
+        run_query(con, request, params)
+    invalidate_cache(db, table)
 
 
 def update_data_in_db(db: str, table: str, update_data: dict, conditions: dict) -> None:
@@ -32,24 +387,11 @@ def update_data_in_db(db: str, table: str, update_data: dict, conditions: dict)
     :return: None
     """
 
-    con = sqlite3.connect(db)
-    cur = con.cursor()
+    request, params = update_request(table, update_data, conditions)
 
-    request = f"""UPDATE {table} SET """
-    for column, value in update_data.items():
-        request += f"{column} = {value}, "
-    request = request[:-2] + (" WHERE " if conditions else "")
-
-    for column, value in conditions.items():
-        request += f"{column} = '{value}' AND "
-    request = request[:-5]
-
-    print(request)
-    cur.execute(request)
-
-    con.commit()
-    con.close()
-    print('updated')
+    with transaction(db) as con:
+        run_query(con, request, params)
+    invalidate_cache(db, table)
 
 
 def delete_data_from_db(db: str, table: str, conditions: dict, not_fl=False) -> None:
@@ -61,22 +403,96 @@ def delete_data_from_db(db: str, table: str, conditions: dict, not_fl=False) ->
     :return: None
     """
 
-    con = sqlite3.connect(db)
-    cur = con.cursor()
+    request, params = delete_request(table, conditions, not_fl)
 
-    request = f"""DELETE FROM {table}{' WHERE ' if conditions else ''}"""
+    with transaction(db) as con:
+        run_query(con, request, params)
+    invalidate_cache(db, table)
 
-    for column, value in conditions.items():
-        request += f"""{column}{' NOT' if not_fl else ''} IN ('{"', '".join(value)}') AND """
-    if conditions:
-        request = request[:-5]
 
-    print(request)
-    cur.execute(request)
+def add_rows_to_db(db: str, table: str, columns: (list, tuple), rows) -> int:
+    """
+    Функция вставляет множество строк одной транзакцией
+    :param db: Используемая база данных
+    :param table: Таблица, в которую вставлять новые значения
+    :param columns: Список колонок, в которые надо вставлять значения
+    :param rows: Итерируемый объект списков вставляемых значений
+    :return: Количество вставленных строк
+    """
+
+    with transaction(db) as con:
+        count = execute_requests(con, (insert_request(table, columns, row) for row in rows))
+    invalidate_cache(db, table)
+
+    return count
+
+
+def update_rows_in_db(db: str, table: str, updates) -> int:
+    """
+    Функция выполняет множество обновлений одной транзакцией
+    :param db: Используемая база данных
+    :param table: Таблица, в которой обновляются значения
+    :param updates: Итерируемый объект пар (обновляемые значения, условия) - словарей
+                    как в update_data_in_db
+    :return: Количество выполненных обновлений
+    """
+
+    with transaction(db) as con:
+        count = execute_requests(con, (update_request(table, update_data, conditions)
+                                       for update_data, conditions in updates))
+    invalidate_cache(db, table)
+
+    return count
+
 
-    con.commit()
-    con.close()
-    print('deleted')
+def delete_rows_from_db(db: str, table: str, conditions_list, not_fl=False) -> int:
+    """
+    Функция выполняет множество удалений одной транзакцией
+    :param db: Используемая база данных
+    :param table: Таблица, в которой удаляются значения
+    :param conditions_list: Итерируемый объект словарей условий как в delete_data_from_db
+    :param not_fl: Флажок, обозначающий нужно ли добавлять NOT перед условиями сравнения
+    :return: Количество выполненных удалений
+    """
+
+    with transaction(db) as con:
+        count = execute_requests(con, (delete_request(table, conditions, not_fl)
+                                       for conditions in conditions_list))
+    invalidate_cache(db, table)
+
+    return count
+
+
+def replace_data_in_db(db: str, table: str, columns: (list, tuple), rows: list,
+                       conditions=None) -> None:
+    """
+    Функция заменяет строки таблицы одной транзакцией: удаление старых строк и вставка новых
+    либо выполняются полностью, либо не выполняются вовсе
+    :param db: Используемая база данных
+    :param table: Таблица, в которой заменяются значения
+    :param columns: Список колонок, в которые надо вставлять значения
+    :param rows: Список кортежей вставляемых значений
+    :param conditions: Словарь условий удаления старых строк вида: <Ключ> = <Значение>
+                       или список таких словарей с одинаковыми ключами (удаляются строки,
+                       подходящие под любой из них). При None удаляются все строки,
+                       при пустом списке старые строки не удаляются
+    :return: None
+    """
+
+    if conditions is None:
+        conditions = [{}]
+    elif isinstance(conditions, dict):
+        conditions = [conditions]
+
+    with transaction(db) as con:  # Фиксируется при успехе, откатывается при ошибке
+        if conditions:
+            delete_request = f"DELETE FROM {table}"
+            if conditions[0]:
+                delete_request += f" WHERE {build_conditions(conditions[0], '=')[0]}"
+            run_query(con, delete_request, [build_conditions(condition, '=')[1]
+                                            for condition in conditions], many=True)
+        execute_requests(con, (insert_request(table, columns, row) for row in rows))
+    invalidate_cache(db, table)
 
 
 def get_data_from_db(db: str, table: str, columns: str,
@@ -94,36 +510,130 @@ def get_data_from_db(db: str, table: str, columns: str,
     :return: Возвращает список кортежей с выбранной информацией
     """
 
-    con = sqlite3.connect(db)
-    cur = con.cursor()
-
-    request = f"""SELECT {'DISTINCT ' if is_distinct else ''}{columns} FROM {table}"""
+    request = f"SELECT {'DISTINCT ' if is_distinct else ''}{columns} FROM {table}"
+    params = []
 
+    conditions = []
     if conditions_equal:
-        request += " WHERE "
-        for column, value in conditions_equal.items():
-            request += f"""{column} IN ('{"', '".join(value)}') AND """
-        request = request[:-5]
-
+        where, where_params = build_conditions(conditions_equal, 'IN')
+        conditions.append(where)
+        params += where_params
     if conditions_like:
-        request += f" {'AND' if conditions_equal else 'WHERE'} "
-        for column, value in conditions_like.items():
-            request += f"{column} LIKE '{value}' OR "
-        request = request[:-4]
+        where, where_params = build_conditions(conditions_like, 'LIKE', joiner=' OR ')
+        conditions.append(f"({where})" if conditions_equal else where)
+        params += where_params
+    if conditions:
+        request += f" WHERE {' AND '.join(conditions)}"
 
     if ordering:
-        request += ' ORDER BY '
-        for column, order_type in ordering.items():
-            request += f"{column} {'ASC' if order_type == 0 else 'DESC'}, "
-        request = request[:-2]
-
-    print(request)
-    res = cur.execute(request).fetchall()
+        request += ' ORDER BY ' + ', '.join(f"{column} {'ASC' if order_type == 0 else 'DESC'}"
+                                            for column, order_type in ordering.items())
 
-    con.close()
+    res = run_query(get_connection(db), request, params, fetch=True)
 
     return res
 
 
+class BatchWriter:
+    """
+    Класс фоновой записи в базу данных: запросы складываются в очередь, а отдельный поток
+    выполняет их пачками - одной транзакцией на пачку. Пачка записывается, когда в ней набралось
+    max_rows запросов или с момента первого запроса прошло interval секунд.
+    Оставшиеся в очереди запросы записываются при close() и при выходе из программы.
+    Ошибка любого запроса откатывает всю его пачку; она передается в следующий flush() или close()
+    """
+
+    def __init__(self, db: str, max_rows=1_000, interval=0.5):
+        """
+        :param db: Используемая база данных
+        :param max_rows: Наибольшее количество запросов в одной транзакции
+        :param interval: Наибольшее время ожидания пачки (с)
+        """
+
+        self.db = db
+        self.max_rows = max_rows
+        self.interval = interval
+        self.errors = []  # Ошибки записи (передаются вызывающему в flush и close)
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='BatchWriter', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add(self, table: str, columns: (list, tuple), values: (list, tuple)) -> None:
+        """ Метод ставит в очередь вставку строки (см. add_data_to_db) """
+
+        self._put(insert_request(table, columns, values))
+
+    def update(self, table: str, update_data: dict, conditions: dict) -> None:
+        """ Метод ставит в очередь обновление строк (см. update_data_in_db) """
+
+        self._put(update_request(table, update_data, conditions))
+
+    def delete(self, table: str, conditions: dict, not_fl=False) -> None:
+        """ Метод ставит в очередь удаление строк (см. delete_data_from_db) """
+
+        self._put(delete_request(table, conditions, not_fl))
+
+    def flush(self) -> None:
+        """ Метод ждет записи всех поставленных в очередь запросов """
+
+        self._queue.join()
+        self._raise_errors()
+
+    def close(self) -> None:
+        """ Метод записывает оставшиеся запросы и останавливает поток записи """
+
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        atexit.unregister(self.close)
+        self._raise_errors()
+
+    def _put(self, request: tuple) -> None:
+        if self._closed:
+            raise RuntimeError('BatchWriter is closed')
+        self._queue.put(request)
+
+    def _raise_errors(self) -> None:
+        if self.errors:
+            error, self.errors = self.errors[0], []
+            raise error
+
+    def _run(self) -> None:
+        """ Цикл потока записи: сбор пачки запросов и ее запись одной транзакцией """
+
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            deadline = monotonic() + self.interval
+
+            # Сбор пачки до max_rows запросов или до истечения interval
+            while len(batch) < self.max_rows and batch[-1] is not None:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - monotonic())))
+                except queue.Empty:
+                    break
+            #
+
+            stop = batch[-1] is None
+            requests = [request for request in batch if request is not None]
+            try:
+                if requests:
+                    with transaction(self.db) as con:
+                        execute_requests(con, requests)
+                    invalidate_cache(self.db)
+            except sqlite3.Error as error:
+                self.errors.append(error)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+        close_thread_connections()
+
+
 if __name__ == '__main__':
     pass
@@ -1,6 +1,14 @@
 from constants import *
 
+import numpy as np
 import sympy as sym
+import itertools as it
+import hashlib
+from collections import OrderedDict, Counter
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+import threading
+import heapq
+import warnings
 from math import radians, degrees
 
 
@@ -17,32 +25,343 @@ class Symbol(sym.Symbol):
         return radians(value) if self.is_angle else value
 
 
+class SolverContext:
+    """
+    Класс параметров решения: набор формул, известность y0 и ускорение свободного падения.
+    Позволяет одновременно решать задачи с известной и неизвестной y0 (в потоках, процессах),
+    не изменяя глобальные y0.is_known и all_form
+    """
+
+    def __init__(self, y0_known=True, g_value=None, formulas=None):
+        """
+        :param y0_known: Считается ли начальная высота известной (равной y0_const)
+        :param g_value: Ускорение свободного падения (None - брать текущее из CONSTANTS)
+        :param formulas: Набор формул (по умолчанию набор для заданной известности y0)
+        """
+
+        self.y0_known = y0_known
+        self.formulas = tuple(get_formulas(y0_known) if formulas is None else formulas)
+        self._g = g_value
+
+    @property
+    def g(self):
+        return CONSTANTS['g'] if self._g is None else self._g
+
+    @staticmethod
+    def current():
+        """ Метод возвращает контекст, соответствующий глобальным y0.is_known и all_form """
+
+        return SolverContext(y0.is_known, formulas=all_form)
+
+
+class MaskAntichain:
+    """
+    Класс антицепи масок переменных: набора масок, ни одна из которых не содержит другую.
+    Для всех надмножеств добавленных масок хранится отметка, поэтому проверка покрытия маски
+    выполняется за одно обращение к массиву. Маски нужно добавлять в порядке неубывания размера
+    """
+
+    def __init__(self, size=None):
+        """ :param size: Количество переменных (по умолчанию len(all_variables)) """
+
+        self.masks = []
+        self._full = (1 << (len(all_variables) if size is None else size)) - 1
+        self._covered = bytearray(self._full + 1)  # Отметки масок, содержащих добавленную
+
+    def covers(self, mask: int) -> bool:
+        """ Метод проверяет, содержит ли маска какую-либо маску антицепи """
+
+        return bool(self._covered[mask])
+
+    def add(self, mask: int) -> bool:
+        """
+        Метод добавляет маску, если она не содержит ни одну из масок антицепи
+        :param mask: Маска
+        :return: Была ли маска добавлена
+        """
+
+        if self._covered[mask]:
+            return False
+        self.masks.append(mask)
+
+        # Отметка всех надмножеств маски (перебор подмножеств свободных битов)
+        free = self._full & ~mask
+        subset = free
+        while True:
+            self._covered[mask | subset] = 1
+            if not subset:
+                break
+            subset = (subset - 1) & free
+        #
+
+        return True
+
+
+class FindCache:
+    """
+    Класс ограниченного кэша решений find() в памяти с вытеснением давно не использованных.
+    Хранит копии словарей и возвращает копии, поэтому вызывающий не может испортить записи.
+    Методы защищены блокировкой: кэш общий для всех потоков процесса
+    """
+
+    def __init__(self, size=None):
+        """ :param size: Наибольшее количество записей (по умолчанию CONSTANTS['cache_size']) """
+
+        self.size = size
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Метод возвращает копию записи и отмечает ее использование
+        :param key: Ключ (см. solution_key)
+        :return: Кортеж словарей (значения, формулы) или None
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return dict(entry[0]), dict(entry[1])
+
+    def put(self, key, values: dict, formulas: dict) -> None:
+        """ Метод сохраняет копию решения, вытесняя давно не использованные записи """
+
+        entry = (dict(values), dict(formulas))
+        size = int(CONSTANTS['cache_size'] if self.size is None else self.size)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """ Метод удаляет все записи (счетчики сохраняются) """
+
+        with self._lock:
+            self._entries.clear()
+
+    def statistics(self) -> dict:
+        """ Метод возвращает счетчики попаданий, промахов и вытеснений """
+
+        with self._lock:
+            statistics = {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                          'size': len(self._entries)}
+        requests = statistics['hits'] + statistics['misses']
+        statistics['hit_rate'] = statistics['hits'] / requests if requests else 0.0
+        return statistics
+
+
+class SolveTimeoutError(ValueError):
+    """ Ошибка превышения времени символьного решения формулы (см. Formula.solve) """
+
+    def __init__(self, formula, target_variable, timeout):
+        super().__init__(f'Превышено время решения формулы {formula.name} для '
+                         f'{target_variable} ({timeout} с)')
+        self.formula = formula
+        self.target_variable = target_variable
+
+
 class Formula:
     """ Класс описания формул для поиска различных величин """
 
     def __init__(self, variables: (list, tuple), formula):
         self.variables = variables
+        self.name = None  # Имя формулы (задается по named_formulas)
+        self.mask = to_mask(variables)  # Битовая маска переменных формулы
         self._formula = formula
+        self._solutions = {}  # Кэш символьных решений формулы для каждой переменной
+        self._compiled = {}  # Кэш скомпилированных (численных) ветвей решений
+        self._pending = {}  # Символьные решения, которые еще находятся в фоне
+        self._timed_out = set()  # Переменные, фоновое решение для которых уже не уложилось во время
 
-    def can_find(self, known_values: dict):
+    def solve(self, target_variable: sym.Symbol, timeout=None) -> list:
+        """
+        Метод возвращает символьные решения (ветви) формулы для целевой переменной.
+        Решение для каждой переменной находится один раз и сохраняется в кэше формулы.
+        Если актуальный модуль generated_solvers содержит решение, оно берется из него,
+        иначе sympy решает формулу в фоновом потоке. Если решение не найдено за timeout
+        секунд, вызывается SolveTimeoutError (и увеличивается счетчик solve_timeouts),
+        а решение продолжается в фоне и попадет в кэш, когда будет найдено
+        :param target_variable: Целевая переменная
+        :param timeout: Время на решение в секундах (по умолчанию CONSTANTS['solve_timeout'],
+                        0 - без ограничения)
+        :return: Список выражений целевой переменной через остальные переменные
+        """
+
+        if target_variable not in self._solutions:
+            key = (self.name, str(target_variable))
+            if generated_solvers is not None and key in generated_solvers.SOLUTIONS:
+                self._solutions[target_variable] = [parse_expression(text)
+                                                    for text in generated_solvers.SOLUTIONS[key]]
+            else:
+                self._solutions[target_variable] = self.solve_in_background(target_variable,
+                                                                            timeout)
+        return self._solutions[target_variable]
+
+    def solve_in_background(self, target_variable: sym.Symbol, timeout=None) -> list:
+        """
+        Метод решает формулу для целевой переменной средствами sympy в фоновом потоке и ждет
+        решения не дольше timeout секунд. Если фоновое решение уже не уложилось во время,
+        следующие вызовы не ждут его повторно, а сразу вызывают SolveTimeoutError
+        :param target_variable: Целевая переменная
+        :param timeout: Время на решение в секундах (см. Formula.solve)
+        :return: Список выражений целевой переменной через остальные переменные
+        """
+
+        def run(future: Future):
+            """ Функция решает формулу и сохраняет решение в кэш формулы """
+
+            try:
+                solutions = sym.solve(self._formula, target_variable)
+            except Exception as exception:
+                future.set_exception(exception)
+            else:
+                self._solutions.setdefault(target_variable, solutions)
+                future.set_result(solutions)
+            finally:  # После ошибки следующий вызов начнет решение заново
+                self._pending.pop(target_variable, None)
+                self._timed_out.discard(target_variable)
+
+        timeout = CONSTANTS['solve_timeout'] if timeout is None else timeout
+        future = self._pending.get(target_variable)
+        if future is None:
+            future = self._pending[target_variable] = Future()
+            self._timed_out.discard(target_variable)
+            # Поток-демон не задерживает завершение программы, если решение зависло
+            threading.Thread(target=run, args=(future,), daemon=True).start()
+
+        try:
+            if timeout and target_variable in self._timed_out and not future.done():
+                raise FutureTimeoutError
+            return future.result(timeout or None)
+        except FutureTimeoutError:
+            self._timed_out.add(target_variable)
+            solve_timeouts[(self.name, str(target_variable))] += 1
+            raise SolveTimeoutError(self, target_variable, timeout) from None
+
+    def find_roots(self, target_variable: sym.Symbol, another_variables: dict) -> list:
+        """
+        Метод численно находит действительные корни формулы для целевой переменной
+        (используется, если символьное решение не найдено вовремя, см. Formula.calc)
+        :param target_variable: Целевая переменная
+        :param another_variables: Словарь значений остальных переменных формулы и g
+        :return: Список различных корней: неотрицательные по возрастанию, затем отрицательные
+                 по возрастанию модуля
+        """
+
+        expression = self._formula.subs(another_variables)
+        tolerance = CONSTANTS['numeric_tolerance']
+        roots = []
+        for start in ROOT_STARTS[target_variable.is_angle]:
+            try:
+                root = complex(sym.nsolve(expression, target_variable, start))
+            except (ValueError, TypeError, ArithmeticError):
+                continue
+            if abs(root.imag) > tolerance:
+                continue
+            if all(abs(root.real - other) > tolerance * max(1, abs(other)) for other in roots):
+                roots.append(root.real)
+        return sorted(roots, key=lambda root: (root < 0, abs(root)))
+
+    def arguments(self, target_variable: sym.Symbol) -> list:
+        """ Метод возвращает порядок аргументов скомпилированных ветвей для целевой переменной """
+
+        return [var for var in self.variables if var != target_variable] + [g]
+
+    def compile(self, target_variable: sym.Symbol, modules='math') -> list:
+        """
+        Метод компилирует каждую ветвь решения для целевой переменной в числовую функцию.
+        Функции принимают значения в порядке Formula.arguments и создаются один раз
+        :param target_variable: Целевая переменная
+        :param modules: Модуль для вычислений ('math' для чисел, 'numpy' для массивов)
+        :return: Список функций, соответствующих ветвям Formula.solve
+        """
+
+        key = (target_variable, modules)
+        if key not in self._compiled:
+            arguments = self.arguments(target_variable)
+            self._compiled[key] = [sym.lambdify(arguments, branch, modules=modules)
+                                   for branch in self.solve(target_variable)]
+        return self._compiled[key]
+
+    def evaluate(self, target_variable: sym.Symbol, arguments: list) -> list:
+        """
+        Метод вычисляет значения всех ветвей решения для целевой переменной.
+        Используется сгенерированная функция (generated_solvers), а если ее нет или
+        какая-то ветвь не определена - скомпилированные ветви (Formula.compile)
+        :param target_variable: Целевая переменная
+        :param arguments: Значения в порядке Formula.arguments
+        :return: Список значений ветвей (None для недействительных значений)
+        """
+
+        def evaluate(function):
+            """ Функция вычисляет ветвь (None если значение не действительное) """
+
+            try:
+                value = function(*arguments)
+            except (ValueError, ZeroDivisionError, OverflowError):
+                return None
+            return None if isinstance(value, complex) else value
+
+        key = (self.name, str(target_variable))
+        if generated_solvers is not None and key in generated_solvers.SOLVERS:
+            try:
+                values = generated_solvers.SOLVERS[key](*arguments)
+                return [None if isinstance(value, complex) else value for value in values]
+            except (ValueError, ZeroDivisionError, OverflowError):
+                pass  # Недействительные ветви определяются по отдельности
+        return [evaluate(function) for function in self.compile(target_variable)]
+
+    def check_roots(self, target_variable: sym.Symbol, arguments: list, values, modules='math'):
+        """
+        Метод проверяет подстановкой в исходную формулу, что значения целевой переменной являются
+        ее корнями (у формул со степенью 0.5 некоторые ветви дают посторонние корни)
+        :param target_variable: Целевая переменная
+        :param arguments: Значения в порядке Formula.arguments
+        :param values: Значение целевой переменной (массив значений для modules='numpy')
+        :param modules: Модуль для вычислений ('math' для чисел, 'numpy' для массивов)
+        :return: True (маска для массивов), если невязка не больше root_tolerance(*arguments)
+        """
+
+        key = ('residual', target_variable, modules)
+        if key not in self._compiled:
+            self._compiled[key] = sym.lambdify(self.arguments(target_variable) + [target_variable],
+                                               self._formula, modules=modules)
+        try:
+            residual = self._compiled[key](*arguments, values)
+        except (ValueError, TypeError, ArithmeticError):
+            return False
+        return np.abs(residual) <= root_tolerance(*arguments)
+
+    def can_find(self, known_values: dict, context=None):
         """
             Метод проверяет возможность найти значение какой-либо переменной по данной формуле,
-            имея known_values.
+            имея known_values (в контексте решения context).
             Вернет переменную, которую можно найти по данной формуле (или None если такой нет)
         """
 
-        if y0.is_known and y0 not in known_values:
+        context = context or SolverContext.current()
+        if context.y0_known and y0 not in known_values:
             known_values[y0] = 0
         unknown_variables = set(self.variables) - set(filter(lambda val: val in self.variables,
                                                              known_values))
         if len(unknown_variables) == 1:
             return list(unknown_variables)[0]
 
-    def calc(self, target_variable: sym.Symbol, another_variables: dict):
+    def calc(self, target_variable: sym.Symbol, another_variables: dict, numeric=False,
+             context=None):
         """
         Метод рассчитывает знаение целевой переменной по заданным остальным значениям
         :param target_variable: Целевая переменная
         :param another_variables: Словарь остальный переменных с их значениями
+        :param numeric: Считать ли значения численно (Formula.evaluate)
+        :param context: Контекст решения (по умолчанию SolverContext.current())
         :return: Числовой ответ
         """
 
@@ -59,83 +378,670 @@ class Formula:
             except TypeError:
                 return True
 
+        def error(reason: str) -> ValueError:
+            """ Функция создает ошибку расчета формулы (текст собирается только при ошибке) """
+
+            known_values = "; ".join(f"{key} = {value}" for key, value in another_variables.items())
+            return ValueError(f'Невозможно рассчитать формулу {target_variable} = {formula[0]},\n'
+                              f'при {known_values}.\n{reason}')
+
         assert all(var in self.variables for var in [target_variable] + list(another_variables)), \
             "Error occurred in Formula.calc_formula. Got incorrect variables."
         assert 1 + len(another_variables) == len(self.variables), \
             f"Error occurred in Formula.calc_formula. Not enough variables (expected " \
             f"{len(self.variables) - 1}, got {len(another_variables)}"
 
-        # Расчет формулы для переменной, выражения и решения для переменной
-        formula = sym.solve(self._formula, target_variable)
-        another_variables[g] = CONSTANTS['g']
-        if y0.is_known and y0 not in another_variables:
+        context = context or SolverContext.current()
+        another_variables[g] = context.g
+        if context.y0_known and y0 not in another_variables:
             another_variables[y0] = y0_const
-        if self.variables == (vmx, v0, a, t) and target_variable == v0:
-            solve = formula[1].subs(another_variables)
-            return solve, formula[1]
-        exp = self._formula.subs(another_variables)
-        solve = list(filter(lambda x: not is_complex(x), sym.solve(exp, target_variable)))
+
+        # Проверка области допустимых значений (без решения формулы)
+        arguments = [another_variables[var] for var in self.arguments(target_variable)]
+        for rejected, reason in self.check_domain(target_variable, arguments):
+            if rejected:
+                # Текст ошибки собирается без решения формулы: если решение еще не найдено,
+                # выводится сама формула
+                formula = self._solutions.get(target_variable) or \
+                    [sym.Function('nsolve')(self._formula, target_variable)]
+                raise error(reason)
+        #
+
+        # Расчет формулы для переменной (из кэша) и значений каждой ее ветви. Если символьное
+        # решение не найдено вовремя, ветвями считаются численно найденные корни формулы
+        try:
+            formula = self.solve(target_variable)
+        except SolveTimeoutError:
+            timed_out = True
+            values = self.find_roots(target_variable, another_variables)
+            formula = [sym.Function('nsolve')(self._formula, target_variable)] * max(1, len(values))
+        else:
+            timed_out = False
+            if numeric:
+                values = self.evaluate(target_variable, arguments)
+            else:
+                values = [branch.subs(another_variables).evalf() for branch in formula]
+
+        if self.variables == (vmx, v0, a, t) and target_variable == v0 and not timed_out:
+            if is_complex(values[1]) or \
+                    not self.check_roots(target_variable, arguments, float(values[1])):
+                raise error(NO_SOLUTIONS)
+            return values[1], formula[1]
+        branches = [(value, branch) for value, branch in zip(values, formula)
+                    if not is_complex(value)
+                    and self.check_roots(target_variable, arguments, float(value))]
+        solve = [value for value, branch in branches]
         #
 
-        known_values = "; ".join(f"{key} = {value}" for key, value in another_variables.items())
         if not solve:  # Проверка на наличие решений
-            raise ValueError(f'Невозможно рассчитать формулу {target_variable} = {formula[0]},\n'
-                             f'при {known_values}.\n Отсутствуют решения')
+            raise error(NO_SOLUTIONS)
 
         if target_variable.is_angle:  # Корректирование ответа случае если переменная является углом
-            val, f = [(rad, [formula[i]]) for i, rad in enumerate(solve)
-                      if 0 <= degrees(rad) <= 90][0]
+            angles = sorted([(rad, branch) for rad, branch in branches if 0 <= degrees(rad) <= 90],
+                            key=lambda branch: branch[0])
 
-            if degrees(val) == 0:
-                raise ValueError(f'Невозможно рассчитать формулу {target_variable} = {formula[0]},\n'
-                                 f'при {known_values}.\nНекорректный угол')
-            return degrees(val), f[0]
+            if not angles or degrees(angles[0][0]) == 0:
+                raise error(INCORRECT_ANGLE)
+            return degrees(angles[0][0]), angles[0][1]
 
         if target_variable == y0 and solve[0] < 10 ** -10:  # Уточнение результата для y0
             if solve[0] < -1:
-                raise ValueError(f'Невозможно рассчитать формулу {target_variable} = {formula[0]},\n'
-                                 f'при {known_values}.\nОтрицательный результат')
+                raise error(NEGATIVE_RESULT)
 
             return 0.0, formula[0]
 
+        if target_variable in time_variables:  # Выбор положительного корня для времени
+            index = choose_time_root(solve)
+            if index is None:
+                raise error(NEGATIVE_RESULT)
+            return branches[index]
+
         positive_index = 0 if solve[0] >= 0 else 1
+        if timed_out and solve[0] < 0:  # Неотрицательные корни идут первыми, значит их нет
+            raise error(NEGATIVE_RESULT)
         try:
-            return solve[positive_index], formula[positive_index]
+            return branches[positive_index]
         except IndexError:
-            raise ValueError(f'Невозможно рассчитать формулу {target_variable} = {formula[0]},\n'
-                             f'при {known_values}.\nОтрицательный результат')
+            raise error(NEGATIVE_RESULT)
+
+    def check_domain(self, target_variable: sym.Symbol, arguments: list) -> list:
+        """
+        Метод проверяет, входят ли значения в область допустимых значений формулы для целевой
+        переменной (см. DOMAINS). Формула при этом не решается
+        :param target_variable: Целевая переменная
+        :param arguments: Значения в порядке Formula.arguments (числа или массивы numpy)
+        :return: Список пар (недопустимость значений, причина ошибки как в Formula.calc);
+                 для массивов недопустимость - маска строк
+        """
+
+        try:
+            arguments = [np.asarray(argument, dtype=float) for argument in arguments]
+        except (TypeError, ValueError):  # Не числа - проверка невозможна
+            return []
+        with np.errstate(all='ignore'):
+            return [(condition(*arguments), reason)
+                    for condition, reason in DOMAINS.get((self, target_variable), [])]
+
+    def calc_batch(self, target_variable: sym.Symbol, another_variables: dict,
+                   context=None) -> (np.ndarray, np.ndarray):
+        """
+        Метод рассчитывает значения целевой переменной сразу для массивов остальных значений.
+        Правила выбора ветви совпадают с Formula.calc, но вместо ValueError строки с ошибкой
+        отмечаются в маске ошибок
+        :param target_variable: Целевая переменная
+        :param another_variables: Словарь остальных переменных с массивами их значений
+        :param context: Контекст решения (по умолчанию SolverContext.current())
+        :return: Кортеж из массива значений (nan при ошибке) и маски строк с ошибкой
+        """
+
+        def nth_valid(number: int, mask=None) -> (np.ndarray, np.ndarray):
+            """
+            Функция выбирает в каждой строке number-ое (с 1) значение ветвей, отмеченное в маске
+            (по умолчанию - действительное)
+            """
+
+            mask = valid if mask is None else mask
+            position = mask & (np.cumsum(mask, axis=0) == number)
+            exists = position.any(axis=0)
+            return np.where(exists, values[position.argmax(axis=0), rows], np.nan), exists
+
+        context = context or SolverContext.current()
+        another_variables[g] = context.g
+        if context.y0_known and y0 not in another_variables:
+            another_variables[y0] = y0_const
+        arguments = [another_variables[var] for var in self.arguments(target_variable)]
+        size = np.broadcast(*arguments).size
+        rows = np.arange(size)
+
+        # Строки вне области допустимых значений отмечаются ошибкой и не рассчитываются
+        rejected = np.zeros(size, dtype=bool)
+        for mask, _ in self.check_domain(target_variable, arguments):
+            rejected |= mask
+        if rejected.any():
+            result, error = np.full(size, np.nan), np.ones(size, dtype=bool)
+            if not rejected.all():
+                result[~rejected], error[~rejected] = self.calc_batch(target_variable, {
+                    var: np.broadcast_to(value, size)[~rejected]
+                    for var, value in zip(self.arguments(target_variable), arguments)
+                }, context)
+            return result, error
+        #
+
+        # Значения каждой ветви: строки - ветви, столбцы - строки входных данных
+        with np.errstate(all='ignore'):
+            values = np.array([
+                np.broadcast_to(np.asarray(function(*arguments), dtype=complex), size)
+                for function in self.compile(target_variable, 'numpy')
+            ])
+            valid = np.isfinite(values) & (values.imag == 0)
+            values = values.real
+            valid &= self.check_roots(target_variable, arguments, values, 'numpy')
+        #
+
+        if self.variables == (vmx, v0, a, t) and target_variable == v0:
+            result = np.where(valid[1], values[1], np.nan)
+            return result, ~valid[1]
+
+        first, has_solve = nth_valid(1)
+        if target_variable.is_angle:  # Наименьший угол из промежутка [0; 90]
+            angles = np.where(valid & (values >= 0) & (values <= np.pi / 2), values, np.inf)
+            result = np.degrees(angles.min(axis=0))
+            error = ~np.isfinite(result) | (result == 0)
+        elif target_variable == y0:  # Уточнение результата для y0
+            result = np.where(first < 10 ** -10, 0.0, first)
+            error = ~has_solve | (first < -1)
+        elif target_variable in time_variables:  # Выбор положительного корня для времени
+            zero = CONSTANTS['root_tolerance'] * np.maximum(
+                1, np.where(valid, np.abs(values), 0).max(axis=0))
+            positive, has_positive = nth_valid(1, valid & (values > zero))
+            zeros, has_zero = nth_valid(1, valid & (np.abs(values) <= zero))
+            result = np.where(has_positive, positive, zeros)
+            error = ~has_positive & ~has_zero
+        else:  # Выбор положительного корня
+            second, has_second = nth_valid(2)
+            result = np.where(first >= 0, first, second)
+            error = ~has_solve | ((first < 0) & ~has_second)
+
+        return np.where(error, np.nan, result), error
+
+
+def root_tolerance(*arguments):
+    """
+    Функция возвращает допустимую невязку корня формулы (см. Formula.check_roots)
+    :param arguments: Значения остальных переменных формулы (числа или массивы numpy)
+    :return: CONSTANTS['root_tolerance'], умноженная на наибольший из модулей значений и 1
+    """
+
+    arguments = [np.abs(np.asarray(argument, dtype=float)) for argument in arguments]
+    return CONSTANTS['root_tolerance'] * np.maximum.reduce(np.broadcast_arrays(1.0, *arguments))
+
+
+def choose_time_root(values: list):
+    """
+    Функция выбирает корень для времени: первый строго положительный, а если его нет - первый
+    нулевой (с точностью CONSTANTS['root_tolerance'] относительно наибольшего из корней)
+    :param values: Действительные значения ветвей решения
+    :return: Индекс выбранного значения или None, если все значения отрицательные
+    """
+
+    zero = CONSTANTS['root_tolerance'] * max([1] + [abs(value) for value in values])
+    positive = [index for index, value in enumerate(values) if value > zero]
+    zeros = [index for index, value in enumerate(values) if abs(value) <= zero]
+    return (positive or zeros or [None])[0]
+
+
+def beyond(value, bound):
+    """
+    Функция проверяет, что значение больше границы с запасом CONSTANTS['root_tolerance']
+    (используется в DOMAINS, чтобы не отвергать значения, которые округляются до границы)
+    :param value: Значение (число или массив numpy)
+    :param bound: Граница (число или массив numpy)
+    :return: True (маска для массивов), если value > bound + root_tolerance
+    """
+
+    return value > bound + CONSTANTS['root_tolerance']
+
+
+def within_unit(value):
+    """
+    Функция проверяет, что значение лежит в (0; 1) с запасом CONSTANTS['root_tolerance']
+    (в DOMAINS: аргумент asin или acos отрицательный, но не меньше -1)
+    :param value: Значение (число или массив numpy)
+    :return: True (маска для массивов), если 0 + root_tolerance < value < 1 - root_tolerance
+    """
+
+    return beyond(value, 0) & beyond(1, value)
 
 
-def find(known_values: dict, variable_formula=None) -> (dict, dict):
+def negative_time(*values):
+    """
+    Функция проверяет, что choose_time_root не выберет ни одно из значений времени: все они
+    отрицательные с той же точностью сравнения с нулем
+    :param values: Значения ветвей решения (числа или массивы numpy)
+    :return: True (маска для массивов), если все значения отрицательные
+    """
+
+    values = np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in values])
+    zero = CONSTANTS['root_tolerance'] * np.maximum.reduce([np.ones_like(values[0])]
+                                                           + [np.abs(value) for value in values])
+    return np.logical_and.reduce([value < -zero for value in values])
+
+
+def get_formulas(y0_known: bool) -> list:
+    """ Функция возвращает набор формул для расчетов в зависимости от известности y0 """
+
+    if y0_known:
+        return [h_v0_a, s_v0_a_y00, vmx_v0_y00, vmn_v0_a, tu_v0_a, td_h, t_tu_td]
+    return [h_v0_a, s_v0_a_t, vmx_v0_a_t, vmn_v0_a, tu_v0_a, td_h, t_tu_td]
+
+
+def formula_definition(formula: Formula) -> str:
+    """ Функция возвращает текстовое определение формулы (имя, переменные, выражение) """
+
+    return f'{formula.name}{tuple(map(str, formula.variables))}: {sym.srepr(formula._formula)}'
+
+
+def parse_expression(text: str):
+    """
+    Функция восстанавливает выражение по его sym.srepr (переменные - объекты all_variables и g)
+    :param text: Текст выражения
+    :return: Выражение sympy
+    """
+
+    return sym.sympify(text, locals={'Symbol': lambda name, **_: symbols_by_name[name]})
+
+
+def formulas_hash() -> str:
+    """ Функция возвращает хэш определений всех формул и их наборов для обоих режимов y0 """
+
+    definitions = [formula_definition(formula)
+                   for _, formula in sorted(named_formulas.items())]
+    for y0_known in (True, False):
+        definitions.append(f'{y0_known}: {[formula.name for formula in get_formulas(y0_known)]}')
+
+    return hashlib.sha256('\n'.join(definitions).encode()).hexdigest()
+
+
+def get_plan(known_variables, targets=None, context=None) -> list:
+    """
+    Функция возвращает план решения: упорядоченный список шагов (формула, искомая переменная).
+    Порядок срабатывания формул зависит только от набора известных переменных, известности y0
+    и набора формул контекста, поэтому план строится один раз и хранится в кэше
+    :param known_variables: Коллекция известных переменных
+    :param targets: Коллекция искомых переменных. Если задана, в плане остаются только шаги,
+                    от которых зависят искомые переменные
+    :param context: Контекст решения (по умолчанию SolverContext.current())
+    :return: Список кортежей (Formula, Symbol) в порядке расчета
+    """
+
+    return get_mask_plan(to_mask(known_variables), None if targets is None else to_mask(targets),
+                         context or SolverContext.current())
+
+
+def get_mask_plan(known: int, targets: int, context: SolverContext) -> list:
+    """
+    Функция возвращает план решения (см. get_plan) по битовым маскам переменных
+    :param known: Маска известных переменных
+    :param targets: Маска искомых переменных (None - все переменные)
+    :param context: Контекст решения
+    :return: Список кортежей (Formula, Symbol) в порядке расчета
+    """
+
+    key = (known, targets, context.y0_known, context.formulas)
+    if key in solve_plans:
+        return solve_plans[key]
+
+    if targets is not None:
+        # Обратный проход по полному плану от искомых переменных к известным
+        needed = targets
+        steps = []
+        for formula, var in reversed(get_mask_plan(known, None, context)):
+            bit = variable_bits[var]
+            if bit & needed:
+                steps.append((formula, var))
+                needed |= formula.mask & ~bit
+        #
+
+        solve_plans[key] = steps[::-1]
+        return solve_plans[key]
+
+    known |= variable_bits[y0] if context.y0_known else 0
+    index = get_formula_index(context.formulas)
+    plan = []
+
+    # Количество неизвестных переменных каждой формулы
+    unknown_counts = [count_bits(formula.mask & ~known) for formula in context.formulas]
+    #
+
+    # Формулы срабатывают в порядке (номер прохода, номер формулы), как при проходах
+    # по всему набору: формула, у которой осталась одна неизвестная, срабатывает в текущем
+    # проходе, если стоит в наборе дальше сработавшей, иначе - в следующем
+    queue = [(0, i) for i, count in enumerate(unknown_counts) if count == 1]
+    while queue:
+        round_number, i = heapq.heappop(queue)
+        if unknown_counts[i] != 1:  # Неизвестная найдена другой формулой
+            continue
+
+        formula = context.formulas[i]
+        bit = formula.mask & ~known
+        plan.append((formula, bit_variables[bit]))
+        known |= bit
+
+        for j in index[bit]:
+            unknown_counts[j] -= 1
+            if unknown_counts[j] == 1:
+                heapq.heappush(queue, (round_number if j > i else round_number + 1, j))
+    #
+
+    solve_plans[key] = plan
+    return plan
+
+
+def get_formula_index(formulas: tuple) -> dict:
+    """
+    Функция возвращает индекс набора формул: для бита каждой переменной - номера формул набора,
+    в которые она входит. Индекс строится один раз для каждого набора
+    :param formulas: Набор формул (SolverContext.formulas)
+    :return: Словарь вида <Бит переменной> = <Список номеров формул>
+    """
+
+    if formulas not in formula_indexes:
+        index = {bit: [] for bit in bit_variables}
+        for i, formula in enumerate(formulas):
+            for var in formula.variables:
+                index[variable_bits[var]].append(i)
+        formula_indexes[formulas] = index
+    return formula_indexes[formulas]
+
+
+def get_known_mask(known: int, context: SolverContext) -> int:
+    """
+    Функция возвращает маску всех переменных, которые можно найти по известным
+    :param known: Маска известных переменных
+    :param context: Контекст решения
+    :return: Маска известных и найденных по плану решения переменных
+    """
+
+    for _, var in get_mask_plan(known, None, context):
+        known |= variable_bits[var]
+    return known | (variable_bits[y0] if context.y0_known else 0)
+
+
+def get_minimal_sets(target: int, context: SolverContext) -> list:
+    """
+    Функция находит все минимальные наборы переменных, по которым структурно (по плану решения,
+    без расчета значений) определяется искомая переменная
+    :param target: Бит искомой переменной
+    :param context: Контекст решения
+    :return: Список масок наборов в порядке возрастания размера (внутри размера - в порядке
+             it.combinations по all_variables)
+    """
+
+    other_bits = [bit for bit in bit_variables if bit != target]
+    minimal_sets = MaskAntichain()
+    for r in range(1, len(other_bits) + 1):
+        for combination in map(sum, it.combinations(other_bits, r)):
+            if minimal_sets.covers(combination):
+                continue
+            if get_known_mask(combination, context) & target:
+                minimal_sets.add(combination)
+    return minimal_sets.masks
+
+
+def get_missing_sets(known_variables, context=None) -> dict:
+    """
+    Функция подсказывает, каких величин не хватает: для каждой переменной, которую нельзя найти
+    по известным, возвращает наименьшие наборы величин, добавив которые, ее можно будет найти
+    :param known_variables: Коллекция известных переменных
+    :param context: Контекст решения (по умолчанию SolverContext.current())
+    :return: Словарь вида <Переменная> = <Список наборов (списков) недостающих переменных>
+    """
+
+    context = context or SolverContext.current()
+    known = get_known_mask(to_mask(known_variables), context)
+
+    missing = {}
+    for target, target_sets in get_minimal_sets_index(context).items():
+        if target & known:
+            continue
+
+        # Дополнения известных величин до минимальных наборов, из них - наименьшие
+        extra_sets = {minimal & ~known for minimal in target_sets}
+        smallest = min(count_bits(extra) for extra in extra_sets)
+        #
+
+        missing[bit_variables[target]] = [from_mask(extra) for extra in sorted(extra_sets)
+                                          if count_bits(extra) == smallest]
+    return missing
+
+
+def get_minimal_sets_index(context: SolverContext) -> dict:
+    """
+    Функция возвращает индекс минимальных наборов (см. get_minimal_sets) всех переменных.
+    Индекс строится один раз для каждой известности y0 и набора формул
+    :param context: Контекст решения
+    :return: Словарь вида <Бит переменной> = <Список масок минимальных наборов>
+    """
+
+    key = (context.y0_known, context.formulas)
+    if key not in minimal_sets_indexes:
+        minimal_sets_indexes[key] = {bit: get_minimal_sets(bit, context) for bit in bit_variables}
+    return minimal_sets_indexes[key]
+
+
+def variable_fingerprint(target: int, context: SolverContext) -> str:
+    """
+    Функция возвращает отпечаток подграфа формул, от которого зависят минимальные наборы
+    переменной (см. get_minimal_sets): хэш определений всех формул набора контекста,
+    связанных с переменной через общие переменные, и известности y0
+    :param target: Бит переменной
+    :param context: Контекст решения
+    :return: Шестнадцатеричная строка хэша
+    """
+
+    index = get_formula_index(context.formulas)
+
+    # Обход гиперграфа формул от переменной (известная y0 не связывает формулы)
+    reached, queue, formula_numbers = target, [target], set()
+    if context.y0_known:
+        reached |= variable_bits[y0]
+    while queue:
+        for i in index[queue.pop()]:
+            formula_numbers.add(i)
+            for bit in bit_variables:
+                if bit & context.formulas[i].mask & ~reached:
+                    reached |= bit
+                    queue.append(bit)
+    #
+
+    definitions = sorted(formula_definition(context.formulas[i]) for i in formula_numbers)
+    definitions.append(f'{bit_variables[target]}, y0 known: {context.y0_known}')
+    return hashlib.sha256('\n'.join(definitions).encode()).hexdigest()
+
+
+def to_mask(variables) -> int:
+    """ Функция возвращает битовую маску коллекции переменных (см. variable_bits) """
+
+    mask = 0
+    for var in variables:
+        mask |= variable_bits[var]
+    return mask
+
+
+def from_mask(mask: int) -> list:
+    """ Функция возвращает список переменных битовой маски в порядке all_variables """
+
+    return [var for var in all_variables if variable_bits[var] & mask]
+
+
+def count_bits(mask: int) -> int:
+    """ Функция возвращает количество переменных битовой маски (int.bit_count - с Python 3.10) """
+
+    return bin(mask).count('1')
+
+
+def precompute_plans(contexts=None):
+    """
+    Функция заранее строит планы решения для всех наборов известных переменных
+    :param contexts: Коллекция контекстов решения (по умолчанию оба режима известности y0)
+    """
+
+    for context in contexts or (SolverContext(True), SolverContext(False)):
+        for r in range(len(all_variables) + 1):
+            for combination in it.combinations(all_variables, r):
+                get_plan(combination, context=context)
+
+
+def find(known_values: dict, variable_formula=None, numeric=False, targets=None,
+         context=None, use_memo=True) -> (dict, dict):
     """
     Функция осуществляет поиск значений всевозможных переменных по известным величинам
     :param known_values: Словарь известных значений (передаваемый словарь будет изменяться)
-    :param variable_formula: Словарь формул для искомых значений (нужен при погружении в функцию)
+    :param variable_formula: Словарь формул для искомых значений (дополняется найденными)
+    :param numeric: Использовать скомпилированные численные ветви вместо подстановки в sympy
+    :param targets: Коллекция искомых переменных. Если задана, рассчитываются только формулы,
+                    от которых они зависят, а словарь формул содержит только искомые переменные
+    :param context: Контекст решения (по умолчанию SolverContext.current())
+    :param use_memo: Искать ли решение в кэше в памяти (find_cache) и в постоянном кэше
+                     (см. set_shot_memo)
     :return: Возвращает кортеж 2-х словарей: словарь известных теперь значений и словарь формул
     """
 
     assert all(isinstance(value, sym.Symbol) for value in known_values), \
         "Error occurred in find() function: not all values has type Sympy.Symbol"
 
-    len_kn_val = len(known_values)
+    context = context or SolverContext.current()
     variable_formula = variable_formula or {}
 
-    # Поиск величин по всем имеющимся формулам
-    for formula in all_form:
-        var = formula.can_find(known_values)
-        if var:
-            val, f = formula.calc(var, {k: k.get_value(v) for k, v in known_values.items()
-                                        if k in formula.variables})
-            known_values[var] = val
-            variable_formula[var] = f
+    # Поиск решения в кэше в памяти, затем в постоянном (известные величины сохраняют
+    # точные значения)
+    key = solution_key(known_values, targets, context) if use_memo else None
+    solution = None if key is None else find_cache.get(key)
+    if solution is None and key is not None and shot_memo is not None:
+        solution = shot_memo.get(key)
+        if solution is not None:
+            find_cache.put(key, *solution)
+    if solution is not None:
+        for var, value in solution[0].items():
+            known_values.setdefault(var, value)
+        variable_formula.update(solution[1])
+        return known_values, variable_formula
     #
 
-    if len_kn_val != len(known_values):  # Если нашлась хоть 1 новая величина, повторяем поиск
-        return find(known_values, variable_formula)
+    if context.y0_known and y0 not in known_values:
+        known_values[y0] = y0_const
 
+    # Поиск величин по плану решения для данного набора известных переменных
+    found_formulas = {}
+    for formula, var in get_plan(known_values, targets, context):
+        val, f = formula.calc(var, {k: k.get_value(v) for k, v in known_values.items()
+                                    if k in formula.variables}, numeric, context)
+        known_values[var] = val
+        if targets is None or var in targets:
+            found_formulas[var] = f
+    variable_formula.update(found_formulas)
+    #
+
+    if key is not None:
+        find_cache.put(key, known_values, found_formulas)
+        if shot_memo is not None:
+            shot_memo.put(key, known_values, found_formulas)
     return known_values, variable_formula
 
 
+def solution_key(known_values: dict, targets, context: SolverContext):
+    """
+    Функция возвращает ключ кэшей решений для набора известных значений
+    :param known_values: Словарь известных значений
+    :param targets: Коллекция искомых переменных (None - все)
+    :param context: Контекст решения
+    :return: Кортеж (хэш формул, известные значения, округленные до
+             CONSTANTS['memo_precision'] знаков, и искомые переменные; известность y0; g) или
+             None, если набор не кэшируется (набор формул контекста отличается от стандартного).
+             После изменения формул решения из постоянного кэша не используются
+    """
+
+    if context.formulas != tuple(get_formulas(context.y0_known)):
+        return None
+
+    precision = int(CONSTANTS['memo_precision'])
+    values = ';'.join(f'{var}={float(known_values[var]):.{precision}f}'
+                      for var in sorted(known_values, key=str))
+    values = formulas_version[:16] + '|' + values
+    if targets is not None:
+        values += '|' + ','.join(sorted(map(str, targets)))
+    return values, int(context.y0_known), float(context.g)
+
+
+def set_shot_memo(memo) -> None:
+    """
+    Функция подключает к find() постоянный кэш решенных бросков
+    :param memo: Кэш с методами key, get, put (см. shot_memo.ShotMemo) или None - отключить
+    """
+
+    global shot_memo
+    shot_memo = memo
+
+
+def find_batch(known_values: dict, targets=None, context=None) -> (dict, dict):
+    """
+    Функция осуществляет поиск значений всевозможных переменных сразу для многих бросков
+    с одинаковым набором известных величин
+    :param known_values: Словарь известных значений вида <Переменная> = <Массив значений>
+    :param targets: Коллекция искомых переменных (рассчитываются только нужные для них формулы)
+    :param context: Контекст решения (по умолчанию SolverContext.current())
+    :return: Возвращает кортеж 2-х словарей: словарь массивов значений всех найденных величин
+             (nan там, где величину найти не удалось) и словарь масок строк с ошибками расчета
+    """
+
+    assert all(isinstance(value, sym.Symbol) for value in known_values), \
+        "Error occurred in find_batch() function: not all values has type Sympy.Symbol"
+
+    context = context or SolverContext.current()
+    # Все известные величины приводятся к одинаковому количеству строк (числа - к столбцам
+    # из одинаковых значений), чтобы массивы значений и маски ошибок шли построчно
+    columns = np.broadcast_arrays(*[np.asarray(value, dtype=float)
+                                    for value in known_values.values()])
+    known_values = {var: np.array(column).ravel() for var, column in zip(known_values, columns)}
+    size = columns[0].size
+    #
+    if context.y0_known and y0 not in known_values:
+        known_values[y0] = np.full(size, float(y0_const))
+    errors = {}
+
+    # Поиск величин по плану решения для данного набора известных переменных
+    for formula, var in get_plan(known_values, targets, context):
+        values, errors[var] = formula.calc_batch(var, {
+            k: np.radians(v) if k.is_angle else v for k, v in known_values.items()
+            if k in formula.variables
+        }, context)
+        known_values[var] = values
+    #
+
+    return known_values, errors
+
+
+def check_numeric(known_values: dict, tolerance=None, context=None) -> bool:
+    """
+    Функция сверяет результаты численного и символьного расчета find()
+    :param known_values: Словарь известных значений (не изменяется)
+    :param tolerance: Допустимая относительная погрешность (по умолчанию CONSTANTS)
+    :param context: Контекст решения (по умолчанию SolverContext.current())
+    :return: True если найдены те же величины и значения совпадают с заданной точностью
+    """
+
+    tolerance = CONSTANTS['numeric_tolerance'] if tolerance is None else tolerance
+    symbolic, _ = find(dict(known_values), context=context, use_memo=False)
+    numeric, _ = find(dict(known_values), numeric=True, context=context, use_memo=False)
+
+    def is_close(expected, value) -> bool:
+        expected, value = float(expected), float(value)
+        return abs(expected - value) <= tolerance * max(1.0, abs(expected))
+
+    return symbolic.keys() == numeric.keys() and \
+        all(is_close(symbolic[var], numeric[var]) for var in symbolic)
+
+
 # Переменные
 g = Symbol('g')
 y0 = Symbol('y0')
@@ -153,6 +1059,11 @@ tu = Symbol('tu')
 td = Symbol('td')
 
 all_variables = [v0, a, h, s, t, vmx, vmn, tu, td, y0]
+time_variables = (t, tu, td)  # Времена: выбирается строго положительный корень
+
+# Битовое представление переменных: наборы переменных в ядре решения - целые числа
+variable_bits = {var: 1 << i for i, var in enumerate(all_variables)}
+bit_variables = {bit: var for var, bit in variable_bits.items()}
 #
 
 # Формулы
@@ -170,7 +1081,107 @@ tu_v0_a = Formula((tu, v0, a), v0 * sym.sin(a) / g - tu)
 td_h = Formula((td, h), (2 * h / g) ** 0.5 - td)
 t_tu_td = Formula((t, tu, td), tu + td - t)
 
-all_form = [h_v0_a, s_v0_a_y00, vmx_v0_y00, vmn_v0_a, tu_v0_a, td_h, t_tu_td]
+# Причины ошибок расчета формул (см. Formula.calc)
+NO_SOLUTIONS = ' Отсутствуют решения'
+INCORRECT_ANGLE = 'Некорректный угол'
+NEGATIVE_RESULT = 'Отрицательный результат'
+
+# Области допустимых значений формул для каждой переменной: списки пар (условие, причина).
+# Условие получает остальные переменные формулы и g в порядке Formula.arguments (углы в
+# радианах, числа или массивы numpy) и истинно, если Formula.calc для этих значений завершится
+# ошибкой с данной причиной. Условия проверяют только заведомо недопустимые значения: у границ
+# области оставлен запас CONSTANTS['root_tolerance'] (см. beyond, within_unit, negative_time)
+DOMAINS = {
+    (h_v0_a, h): [(lambda v0, a, y0, g: y0 + (v0 * np.sin(a)) ** 2 / (2 * g) < 0,
+                   NEGATIVE_RESULT)],
+    (h_v0_a, v0): [(lambda h, a, y0, g: g * (h - y0) < 0, NO_SOLUTIONS)],
+    (h_v0_a, a): [(lambda h, v0, y0, g: g * (h - y0) < 0, NO_SOLUTIONS),
+                  (lambda h, v0, y0, g: beyond(2 * g * (h - y0) / v0 ** 2, 1), NO_SOLUTIONS)],
+    (h_v0_a, y0): [(lambda h, v0, a, g: h - (v0 * np.sin(a)) ** 2 / (2 * g) < -1,
+                    NEGATIVE_RESULT)],
+
+    (s_v0_a_y00, s): [(lambda v0, a, g: v0 ** 2 * np.sin(2 * a) / g < 0, NEGATIVE_RESULT)],
+    (s_v0_a_y00, v0): [(lambda s, a, g: g * s * np.sin(2 * a) < 0, NO_SOLUTIONS)],
+    (s_v0_a_y00, a): [(lambda s, v0, g: beyond(np.abs(g * s / v0 ** 2), 1), NO_SOLUTIONS),
+                      (lambda s, v0, g: within_unit(-g * s / v0 ** 2) | ((s == 0) & (v0 != 0)),
+                       INCORRECT_ANGLE)],
+
+    (s_v0_a_t, s): [(lambda v0, a, t, g: v0 * np.cos(a) * t < 0, NEGATIVE_RESULT)],
+    (s_v0_a_t, v0): [(lambda s, a, t, g: s * t * np.cos(a) < 0, NEGATIVE_RESULT)],
+    (s_v0_a_t, a): [(lambda s, v0, t, g: beyond(np.abs(s / (t * v0)), 1), NO_SOLUTIONS),
+                    (lambda s, v0, t, g: within_unit(-s / (t * v0)), INCORRECT_ANGLE)],
+    (s_v0_a_t, t): [(lambda s, v0, a, g: negative_time(s / (v0 * np.cos(a))), NEGATIVE_RESULT)],
+
+    (vmx_v0_y00, vmx): [(lambda v0, g: v0 < 0, NEGATIVE_RESULT)],
+    (vmx_v0_y00, v0): [(lambda vmx, g: vmx < 0, NEGATIVE_RESULT)],
+
+    # vmx - значение корня: при vmx < 0 все ветви дают посторонние корни
+    (vmx_v0_a_t, v0): [(lambda vmx, *others: -vmx > root_tolerance(vmx, *others), NO_SOLUTIONS)],
+    (vmx_v0_a_t, a): [(lambda vmx, *others: -vmx > root_tolerance(vmx, *others), NO_SOLUTIONS)],
+    (vmx_v0_a_t, t): [
+        (lambda vmx, *others: -vmx > root_tolerance(vmx, *others), NO_SOLUTIONS),
+        (lambda vmx, v0, a, g: beyond((v0 * np.cos(a) / vmx) ** 2, 1), NO_SOLUTIONS),
+        (lambda vmx, v0, a, g: negative_time(
+            (v0 * np.sin(a) - np.sqrt(vmx ** 2 - (v0 * np.cos(a)) ** 2)) / g,
+            (v0 * np.sin(a) + np.sqrt(vmx ** 2 - (v0 * np.cos(a)) ** 2)) / g
+        ), NEGATIVE_RESULT)
+    ],
+
+    (vmn_v0_a, vmn): [(lambda v0, a, g: v0 * np.cos(a) < 0, NEGATIVE_RESULT)],
+    (vmn_v0_a, v0): [(lambda vmn, a, g: vmn * np.cos(a) < 0, NEGATIVE_RESULT)],
+    (vmn_v0_a, a): [(lambda vmn, v0, g: beyond(np.abs(vmn / v0), 1), NO_SOLUTIONS),
+                    (lambda vmn, v0, g: within_unit(-vmn / v0), INCORRECT_ANGLE)],
+
+    (tu_v0_a, tu): [(lambda v0, a, g: negative_time(v0 * np.sin(a) / g), NEGATIVE_RESULT)],
+    (tu_v0_a, v0): [(lambda tu, a, g: g * tu * np.sin(a) < 0, NEGATIVE_RESULT)],
+    (tu_v0_a, a): [(lambda tu, v0, g: beyond(np.abs(g * tu / v0), 1), NO_SOLUTIONS),
+                   (lambda tu, v0, g: (g * tu * v0 <= 0) & beyond(1, np.abs(g * tu / v0)),
+                    INCORRECT_ANGLE)],
+
+    (td_h, td): [(lambda h, g: h * g < 0, NO_SOLUTIONS)],
+    (td_h, h): [(lambda td, g: -td > root_tolerance(td, g), NO_SOLUTIONS)],  # Посторонний корень
+
+    (t_tu_td, t): [(lambda tu, td, g: negative_time(tu + td), NEGATIVE_RESULT)],
+    (t_tu_td, tu): [(lambda t, td, g: negative_time(t - td), NEGATIVE_RESULT)],
+    (t_tu_td, td): [(lambda t, tu, g: negative_time(t - tu), NEGATIVE_RESULT)],
+}
+#
+
+all_form = get_formulas(True)
+solve_plans = {}  # Кэш планов решения (см. get_plan)
+formula_indexes = {}  # Кэш индексов переменная -> формулы (см. get_formula_index)
+minimal_sets_indexes = {}  # Кэш индексов минимальных наборов (см. get_minimal_sets_index)
+shot_memo = None  # Постоянный кэш решенных бросков (см. set_shot_memo)
+find_cache = FindCache()  # Кэш решений find() в памяти (сбрасывается при изменении настроек)
+solve_timeouts = Counter()  # Количество расчетов без символьного решения (превышено время)
+# Начальные приближения численного поиска корней (см. Formula.find_roots): для углов (в
+# радианах) и для остальных величин
+ROOT_STARTS = {True: (0.1, 0.4, 0.8, 1.2, 1.5), False: (0.1, 1, 10, 100, 1_000)}
+constants_listeners.append(find_cache.clear)
+
+named_formulas = {
+    'h_v0_a': h_v0_a, 's_v0_a_y00': s_v0_a_y00, 's_v0_a_t': s_v0_a_t,
+    'vmx_v0_y00': vmx_v0_y00, 'vmx_v0_a_t': vmx_v0_a_t, 'vmn_v0_a': vmn_v0_a,
+    'tu_v0_a': tu_v0_a, 'td_h': td_h, 't_tu_td': t_tu_td
+}
+for formula_name, named_formula in named_formulas.items():
+    named_formula.name = formula_name
+symbols_by_name = {str(var): var for var in all_variables + [g]}
+#
+
+# Хэш определений формул при загрузке модуля (входит в ключи постоянного кэша решений)
+formulas_version = formulas_hash()
+
+# Сгенерированные заранее решения формул (см. generate_solvers.py)
+try:
+    import generated_solvers
+except ImportError:
+    generated_solvers = None
+
+if generated_solvers is not None and generated_solvers.FORMULAS_HASH != formulas_version:
+    warnings.warn('Модуль generated_solvers устарел: формулы изменились. Решения будут найдены '
+                  'во время работы, для обновления запустите generate_solvers.py')
+    generated_solvers = None
 #
 
 # "Хорошие" значения для поиска комбинаций переменных
@@ -0,0 +1,64 @@
+import sys
+
+from sympy.printing.pycode import pycode
+
+from formulas import *
+
+
+MODULE = 'generated_solvers.py'
+
+
+def generate_function(function_name: str, arguments: list, branches: list) -> list:
+    """
+    Функция генерирует код функции, вычисляющей все ветви решения
+    (с выделением общих подвыражений)
+    :param function_name: Имя функции
+    :param arguments: Аргументы функции
+    :param branches: Ветви решения
+    :return: Список строк кода
+    """
+
+    replacements, reduced = sym.cse(branches, symbols=sym.numbered_symbols('_x'))
+
+    lines = [f'def {function_name}({", ".join(map(str, arguments))}):']
+    for variable, expression in replacements:
+        lines.append(f'    {variable} = {pycode(expression)}')
+    lines.append(f'    return [{", ".join(pycode(branch) for branch in reduced)}]')
+
+    return lines
+
+
+def generate(path=MODULE):
+    """ Функция решает все формулы для каждой переменной и записывает модуль с решениями """
+
+    functions, solvers, solutions = [], [], []
+    for name, formula in sorted(named_formulas.items()):
+        for var in formula.variables:
+            print(name, var)
+            branches = sym.solve(formula._formula, var)
+            function_name = f'{name}__{var}'
+
+            functions += generate_function(function_name, formula.arguments(var), branches)
+            functions += ['', '']
+            solvers.append(f"    ('{name}', '{var}'): {function_name},")
+            branches = [sym.srepr(branch) for branch in branches]
+            solutions.append(f"    ('{name}', '{var}'): {branches},")
+
+    lines = [
+        '# Модуль сгенерирован generate_solvers.py по формулам из formulas.py, не изменять вручную',
+        'import math', '', '',
+        f"FORMULAS_HASH = '{formulas_hash()}'", '', '',
+        *functions,
+        'SOLVERS = {', *solvers, '}', '',
+        'SOLUTIONS = {', *solutions, '}', ''
+    ]
+    with open(path, mode='w', encoding='utf-8') as module:
+        module.write('\n'.join(lines))
+
+
+if __name__ == '__main__':
+    if generated_solvers is not None and '--force' not in sys.argv:
+        print(f'{MODULE} is up to date')
+        exit()
+
+    generate()
@@ -0,0 +1,199 @@
+# Модуль сгенерирован generate_solvers.py по формулам из formulas.py, не изменять вручную
+import math
+
+
+FORMULAS_HASH = 'cc67f09b0c48594c75cba675d7605019e16d78d26bc113b4e270bf116f29061b'
+
+
+def h_v0_a__h(v0, a, y0, g):
+    return [y0 + (1/2)*v0**2*math.sin(a)**2/g]
+
+
+def h_v0_a__v0(h, a, y0, g):
+    _x0 = math.sqrt(2)*math.sqrt(g*(h - y0))/math.sin(a)
+    return [-_x0, _x0]
+
+
+def h_v0_a__a(h, v0, y0, g):
+    _x0 = math.asin(math.sqrt(2)*math.sqrt(-g*(-h + y0))/v0)
+    return [math.pi - _x0, _x0 + math.pi, -_x0, _x0]
+
+
+def h_v0_a__y0(h, v0, a, g):
+    return [h - 1/2*v0**2*math.sin(a)**2/g]
+
+
+def s_v0_a_t__s(v0, a, t, g):
+    return [t*v0*math.cos(a)]
+
+
+def s_v0_a_t__v0(s, a, t, g):
+    return [s/(t*math.cos(a))]
+
+
+def s_v0_a_t__a(s, v0, t, g):
+    _x0 = math.acos(s/(t*v0))
+    return [-_x0 + 2*math.pi, _x0]
+
+
+def s_v0_a_t__t(s, v0, a, g):
+    return [s/(v0*math.cos(a))]
+
+
+def s_v0_a_y00__s(v0, a, g):
+    return [v0**2*math.sin(2*a)/g]
+
+
+def s_v0_a_y00__v0(s, a, g):
+    _x0 = math.sqrt(g*s/math.sin(2*a))
+    return [-_x0, _x0]
+
+
+def s_v0_a_y00__a(s, v0, g):
+    _x0 = (1/2)*math.asin(g*s/v0**2)
+    return [-_x0 + (1/2)*math.pi, _x0]
+
+
+def t_tu_td__t(tu, td, g):
+    return [td + tu]
+
+
+def t_tu_td__tu(t, td, g):
+    return [t - td]
+
+
+def t_tu_td__td(t, tu, g):
+    return [t - tu]
+
+
+def td_h__td(h, g):
+    return [1.4142135623731*math.sqrt(h/g)]
+
+
+def td_h__h(td, g):
+    return [0.499999999999997*g*td**2]
+
+
+def tu_v0_a__tu(v0, a, g):
+    return [v0*math.sin(a)/g]
+
+
+def tu_v0_a__v0(tu, a, g):
+    return [g*tu/math.sin(a)]
+
+
+def tu_v0_a__a(tu, v0, g):
+    _x0 = math.asin(g*tu/v0)
+    return [math.pi - _x0, _x0]
+
+
+def vmn_v0_a__vmn(v0, a, g):
+    return [v0*math.cos(a)]
+
+
+def vmn_v0_a__v0(vmn, a, g):
+    return [vmn/math.cos(a)]
+
+
+def vmn_v0_a__a(vmn, v0, g):
+    _x0 = math.acos(vmn/v0)
+    return [-_x0 + 2*math.pi, _x0]
+
+
+def vmx_v0_a_t__vmx(v0, a, t, g):
+    return [math.sqrt(g**2*t**2 - 2.0*g*t*v0*math.sin(a) + v0**2)]
+
+
+def vmx_v0_a_t__v0(vmx, a, t, g):
+    _x0 = g*t*math.sin(a)
+    _x1 = math.sqrt(-g**2*t**2*math.cos(a)**2 + vmx**2)
+    return [_x0 - _x1, _x0 + _x1]
+
+
+def vmx_v0_a_t__a(vmx, v0, t, g):
+    _x0 = v0**2
+    _x1 = vmx**2
+    _x2 = g**2
+    _x3 = t**2
+    _x4 = 1/(_x0 - _x1 + _x2*_x3)
+    _x5 = 2.0*g*t*v0
+    _x6 = math.sqrt(2.0*_x0*_x1 + 2.0*_x0*_x2*_x3 + 2.0*_x1*_x2*_x3 - g**4*t**4 - v0**4 - vmx**4)
+    return [2.0*math.atan(_x4*(_x5 - _x6)), 2.0*math.atan(_x4*(_x5 + _x6))]
+
+
+def vmx_v0_a_t__t(vmx, v0, a, g):
+    _x0 = 1/g
+    _x1 = v0*math.sin(a)
+    _x2 = math.sqrt(-v0**2*math.cos(a)**2 + vmx**2)
+    return [_x0*(_x1 - _x2), _x0*(_x1 + _x2)]
+
+
+def vmx_v0_y00__vmx(v0, g):
+    return [v0]
+
+
+def vmx_v0_y00__v0(vmx, g):
+    return [vmx]
+
+
+SOLVERS = {
+    ('h_v0_a', 'h'): h_v0_a__h,
+    ('h_v0_a', 'v0'): h_v0_a__v0,
+    ('h_v0_a', 'a'): h_v0_a__a,
+    ('h_v0_a', 'y0'): h_v0_a__y0,
+    ('s_v0_a_t', 's'): s_v0_a_t__s,
+    ('s_v0_a_t', 'v0'): s_v0_a_t__v0,
+    ('s_v0_a_t', 'a'): s_v0_a_t__a,
+    ('s_v0_a_t', 't'): s_v0_a_t__t,
+    ('s_v0_a_y00', 's'): s_v0_a_y00__s,
+    ('s_v0_a_y00', 'v0'): s_v0_a_y00__v0,
+    ('s_v0_a_y00', 'a'): s_v0_a_y00__a,
+    ('t_tu_td', 't'): t_tu_td__t,
+    ('t_tu_td', 'tu'): t_tu_td__tu,
+    ('t_tu_td', 'td'): t_tu_td__td,
+    ('td_h', 'td'): td_h__td,
+    ('td_h', 'h'): td_h__h,
+    ('tu_v0_a', 'tu'): tu_v0_a__tu,
+    ('tu_v0_a', 'v0'): tu_v0_a__v0,
+    ('tu_v0_a', 'a'): tu_v0_a__a,
+    ('vmn_v0_a', 'vmn'): vmn_v0_a__vmn,
+    ('vmn_v0_a', 'v0'): vmn_v0_a__v0,
+    ('vmn_v0_a', 'a'): vmn_v0_a__a,
+    ('vmx_v0_a_t', 'vmx'): vmx_v0_a_t__vmx,
+    ('vmx_v0_a_t', 'v0'): vmx_v0_a_t__v0,
+    ('vmx_v0_a_t', 'a'): vmx_v0_a_t__a,
+    ('vmx_v0_a_t', 't'): vmx_v0_a_t__t,
+    ('vmx_v0_y00', 'vmx'): vmx_v0_y00__vmx,
+    ('vmx_v0_y00', 'v0'): vmx_v0_y00__v0,
+}
+
+SOLUTIONS = {
+    ('h_v0_a', 'h'): ["Add(Symbol('y0'), Mul(Rational(1, 2), Pow(Symbol('g'), Integer(-1)), Pow(Symbol('v0'), Integer(2)), Pow(sin(Symbol('a', is_angle=True)), Integer(2))))"],
+    ('h_v0_a', 'v0'): ["Mul(Integer(-1), Pow(Integer(2), Rational(1, 2)), Pow(Mul(Symbol('g'), Add(Symbol('h'), Mul(Integer(-1), Symbol('y0')))), Rational(1, 2)), Pow(sin(Symbol('a', is_angle=True)), Integer(-1)))", "Mul(Pow(Integer(2), Rational(1, 2)), Pow(Mul(Symbol('g'), Add(Symbol('h'), Mul(Integer(-1), Symbol('y0')))), Rational(1, 2)), Pow(sin(Symbol('a', is_angle=True)), Integer(-1)))"],
+    ('h_v0_a', 'a'): ["Add(pi, Mul(Integer(-1), asin(Mul(Pow(Integer(2), Rational(1, 2)), Pow(Symbol('v0'), Integer(-1)), Pow(Mul(Integer(-1), Symbol('g'), Add(Mul(Integer(-1), Symbol('h')), Symbol('y0'))), Rational(1, 2))))))", "Add(asin(Mul(Pow(Integer(2), Rational(1, 2)), Pow(Symbol('v0'), Integer(-1)), Pow(Mul(Integer(-1), Symbol('g'), Add(Mul(Integer(-1), Symbol('h')), Symbol('y0'))), Rational(1, 2)))), pi)", "Mul(Integer(-1), asin(Mul(Pow(Integer(2), Rational(1, 2)), Pow(Symbol('v0'), Integer(-1)), Pow(Mul(Integer(-1), Symbol('g'), Add(Mul(Integer(-1), Symbol('h')), Symbol('y0'))), Rational(1, 2)))))", "asin(Mul(Pow(Integer(2), Rational(1, 2)), Pow(Symbol('v0'), Integer(-1)), Pow(Mul(Integer(-1), Symbol('g'), Add(Mul(Integer(-1), Symbol('h')), Symbol('y0'))), Rational(1, 2))))"],
+    ('h_v0_a', 'y0'): ["Add(Symbol('h'), Mul(Integer(-1), Rational(1, 2), Pow(Symbol('g'), Integer(-1)), Pow(Symbol('v0'), Integer(2)), Pow(sin(Symbol('a', is_angle=True)), Integer(2))))"],
+    ('s_v0_a_t', 's'): ["Mul(Symbol('t'), Symbol('v0'), cos(Symbol('a', is_angle=True)))"],
+    ('s_v0_a_t', 'v0'): ["Mul(Symbol('s'), Pow(Symbol('t'), Integer(-1)), Pow(cos(Symbol('a', is_angle=True)), Integer(-1)))"],
+    ('s_v0_a_t', 'a'): ["Add(Mul(Integer(-1), acos(Mul(Symbol('s'), Pow(Symbol('t'), Integer(-1)), Pow(Symbol('v0'), Integer(-1))))), Mul(Integer(2), pi))", "acos(Mul(Symbol('s'), Pow(Symbol('t'), Integer(-1)), Pow(Symbol('v0'), Integer(-1))))"],
+    ('s_v0_a_t', 't'): ["Mul(Symbol('s'), Pow(Symbol('v0'), Integer(-1)), Pow(cos(Symbol('a', is_angle=True)), Integer(-1)))"],
+    ('s_v0_a_y00', 's'): ["Mul(Pow(Symbol('g'), Integer(-1)), Pow(Symbol('v0'), Integer(2)), sin(Mul(Integer(2), Symbol('a', is_angle=True))))"],
+    ('s_v0_a_y00', 'v0'): ["Mul(Integer(-1), Pow(Mul(Symbol('g'), Symbol('s'), Pow(sin(Mul(Integer(2), Symbol('a', is_angle=True))), Integer(-1))), Rational(1, 2)))", "Pow(Mul(Symbol('g'), Symbol('s'), Pow(sin(Mul(Integer(2), Symbol('a', is_angle=True))), Integer(-1))), Rational(1, 2))"],
+    ('s_v0_a_y00', 'a'): ["Add(Mul(Integer(-1), Rational(1, 2), asin(Mul(Symbol('g'), Symbol('s'), Pow(Symbol('v0'), Integer(-2))))), Mul(Rational(1, 2), pi))", "Mul(Rational(1, 2), asin(Mul(Symbol('g'), Symbol('s'), Pow(Symbol('v0'), Integer(-2)))))"],
+    ('t_tu_td', 't'): ["Add(Symbol('td'), Symbol('tu'))"],
+    ('t_tu_td', 'tu'): ["Add(Symbol('t'), Mul(Integer(-1), Symbol('td')))"],
+    ('t_tu_td', 'td'): ["Add(Symbol('t'), Mul(Integer(-1), Symbol('tu')))"],
+    ('td_h', 'td'): ["Mul(Float('1.4142135623731', precision=53), Pow(Mul(Pow(Symbol('g'), Integer(-1)), Symbol('h')), Rational(1, 2)))"],
+    ('td_h', 'h'): ["Mul(Float('0.4999999999999965', precision=53), Symbol('g'), Pow(Symbol('td'), Integer(2)))"],
+    ('tu_v0_a', 'tu'): ["Mul(Pow(Symbol('g'), Integer(-1)), Symbol('v0'), sin(Symbol('a', is_angle=True)))"],
+    ('tu_v0_a', 'v0'): ["Mul(Symbol('g'), Symbol('tu'), Pow(sin(Symbol('a', is_angle=True)), Integer(-1)))"],
+    ('tu_v0_a', 'a'): ["Add(pi, Mul(Integer(-1), asin(Mul(Symbol('g'), Symbol('tu'), Pow(Symbol('v0'), Integer(-1))))))", "asin(Mul(Symbol('g'), Symbol('tu'), Pow(Symbol('v0'), Integer(-1))))"],
+    ('vmn_v0_a', 'vmn'): ["Mul(Symbol('v0'), cos(Symbol('a', is_angle=True)))"],
+    ('vmn_v0_a', 'v0'): ["Mul(Symbol('vmn'), Pow(cos(Symbol('a', is_angle=True)), Integer(-1)))"],
+    ('vmn_v0_a', 'a'): ["Add(Mul(Integer(-1), acos(Mul(Pow(Symbol('v0'), Integer(-1)), Symbol('vmn')))), Mul(Integer(2), pi))", "acos(Mul(Pow(Symbol('v0'), Integer(-1)), Symbol('vmn')))"],
+    ('vmx_v0_a_t', 'vmx'): ["Pow(Add(Mul(Pow(Symbol('g'), Integer(2)), Pow(Symbol('t'), Integer(2))), Mul(Integer(-1), Float('2.0', precision=53), Symbol('g'), Symbol('t'), Symbol('v0'), sin(Symbol('a', is_angle=True))), Pow(Symbol('v0'), Integer(2))), Rational(1, 2))"],
+    ('vmx_v0_a_t', 'v0'): ["Add(Mul(Symbol('g'), Symbol('t'), sin(Symbol('a', is_angle=True))), Mul(Integer(-1), Pow(Add(Mul(Integer(-1), Pow(Symbol('g'), Integer(2)), Pow(Symbol('t'), Integer(2)), Pow(cos(Symbol('a', is_angle=True)), Integer(2))), Pow(Symbol('vmx'), Integer(2))), Rational(1, 2))))", "Add(Mul(Symbol('g'), Symbol('t'), sin(Symbol('a', is_angle=True))), Pow(Add(Mul(Integer(-1), Pow(Symbol('g'), Integer(2)), Pow(Symbol('t'), Integer(2)), Pow(cos(Symbol('a', is_angle=True)), Integer(2))), Pow(Symbol('vmx'), Integer(2))), Rational(1, 2)))"],
+    ('vmx_v0_a_t', 'a'): ["Mul(Float('2.0', precision=53), atan(Mul(Add(Mul(Float('2.0', precision=53), Symbol('g'), Symbol('t'), Symbol('v0')), Mul(Integer(-1), Pow(Add(Mul(Integer(-1), Pow(Symbol('g'), Integer(4)), Pow(Symbol('t'), Integer(4))), Mul(Float('2.0', precision=53), Pow(Symbol('g'), Integer(2)), Pow(Symbol('t'), Integer(2)), Pow(Symbol('v0'), Integer(2))), Mul(Float('2.0', precision=53), Pow(Symbol('g'), Integer(2)), Pow(Symbol('t'), Integer(2)), Pow(Symbol('vmx'), Integer(2))), Mul(Integer(-1), Pow(Symbol('v0'), Integer(4))), Mul(Float('2.0', precision=53), Pow(Symbol('v0'), Integer(2)), Pow(Symbol('vmx'), Integer(2))), Mul(Integer(-1), Pow(Symbol('vmx'), Integer(4)))), Rational(1, 2)))), Pow(Add(Mul(Pow(Symbol('g'), Integer(2)), Pow(Symbol('t'), Integer(2))), Pow(Symbol('v0'), Integer(2)), Mul(Integer(-1), Pow(Symbol('vmx'), Integer(2)))), Integer(-1)))))", "Mul(Float('2.0', precision=53), atan(Mul(Add(Mul(Float('2.0', precision=53), Symbol('g'), Symbol('t'), Symbol('v0')), Pow(Add(Mul(Integer(-1), Pow(Symbol('g'), Integer(4)), Pow(Symbol('t'), Integer(4))), Mul(Float('2.0', precision=53), Pow(Symbol('g'), Integer(2)), Pow(Symbol('t'), Integer(2)), Pow(Symbol('v0'), Integer(2))), Mul(Float('2.0', precision=53), Pow(Symbol('g'), Integer(2)), Pow(Symbol('t'), Integer(2)), Pow(Symbol('vmx'), Integer(2))), Mul(Integer(-1), Pow(Symbol('v0'), Integer(4))), Mul(Float('2.0', precision=53), Pow(Symbol('v0'), Integer(2)), Pow(Symbol('vmx'), Integer(2))), Mul(Integer(-1), Pow(Symbol('vmx'), Integer(4)))), Rational(1, 2))), Pow(Add(Mul(Pow(Symbol('g'), Integer(2)), Pow(Symbol('t'), Integer(2))), Pow(Symbol('v0'), Integer(2)), Mul(Integer(-1), Pow(Symbol('vmx'), Integer(2)))), Integer(-1)))))"],
+    ('vmx_v0_a_t', 't'): ["Mul(Pow(Symbol('g'), Integer(-1)), Add(Mul(Symbol('v0'), sin(Symbol('a', is_angle=True))), Mul(Integer(-1), Pow(Add(Mul(Integer(-1), Pow(Symbol('v0'), Integer(2)), Pow(cos(Symbol('a', is_angle=True)), Integer(2))), Pow(Symbol('vmx'), Integer(2))), Rational(1, 2)))))", "Mul(Pow(Symbol('g'), Integer(-1)), Add(Mul(Symbol('v0'), sin(Symbol('a', is_angle=True))), Pow(Add(Mul(Integer(-1), Pow(Symbol('v0'), Integer(2)), Pow(cos(Symbol('a', is_angle=True)), Integer(2))), Pow(Symbol('vmx'), Integer(2))), Rational(1, 2))))"],
+    ('vmx_v0_y00', 'vmx'): ["Symbol('v0')"],
+    ('vmx_v0_y00', 'v0'): ["Symbol('vmx')"],
+}
@@ -1,42 +1,37 @@
-import itertools as it
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import time
+import argparse
 
 from formulas import *
 from constants import MY_DB
 from database_requests import *
-from time import time
+from migrations import migrate
 
 
-def check(combination, find_element) -> bool:
-    """ Функция проверяет можно ли найти искомую переменную по заданным значениям """
+COLUMNS = ('variable', 'required_values', 'is_known')
+FINGERPRINTS_TABLE = 'collections_fingerprints'  # Отпечатки подграфов формул (см. migrations)
 
-    known_values = {value: best_values[value] for value in combination}
-    find(known_values)
-    return find_element in known_values
 
+def check(combination: int, find_element: int, context: SolverContext) -> bool:
+    """ Функция проверяет можно ли найти искомую переменную (бит) по заданным значениям (маске) """
 
-def is_unique(combination, unique_combs) -> bool:
-    """ Функция проверяет уникальность найденной комбинации """
+    known_values = {value: best_values[value] for value in from_mask(combination)}
+    try:
+        find(known_values, context=context)
+    except ValueError:
+        return False
+    return bool(to_mask(known_values) & find_element)
 
-    for un_comb in unique_combs:
-        if set(un_comb).issubset(combination):
-            return False
-    return True
 
-
-def get_collections(y0_fame: bool):
-    """ Функция генерирует коллекции переменных для поиска всех переменных, учитывая состояние y0 """
+def get_collections(y0_fame: bool, validate=False):
+    """
+    Функция генерирует коллекции переменных для поиска всех переменных, учитывая состояние y0
+    :param y0_fame: Известность y0
+    :param validate: Проверять ли найденные наборы численно (расчетом по best_values)
+    """
 
     print(y0_fame)
-    y0.is_known = y0_fame
-
-    # Смена формул при необходимости
-    if not y0_fame:
-        index_s = all_form.index(s_v0_a_y00)
-        index_vmx = all_form.index(vmx_v0_y00)
-
-        all_form[index_s] = s_v0_a_t
-        all_form[index_vmx] = vmx_v0_a_t
-    #
+    context = SolverContext(y0_fame)  # Набор формул в зависимости от известности y0
 
     start = time()
     variables_collections = {}
@@ -44,24 +39,17 @@ def get_collections(y0_fame: bool):
     for var in all_variables:
         print(var, end=' ')
         start_time = time()
-        find_element = var
-        other_elements = [var for var in all_variables if var != find_element]
-
-        # Поиск всех комбинаций с которыми можно найти искомую величину
-        combs = []
-        for r in range(1, 3 + 1):
-            combs.append(it.combinations(other_elements, r))
-        all_combinations = filter(lambda coll: check(coll, find_element), it.chain(*combs))
-        #
 
-        # Фильтрация найденных комбинаций по уникальности
-        unique_combs = []
-        for comb in all_combinations:
-            if is_unique(comb, unique_combs):
-                unique_combs.append(comb)
+        # Все минимальные наборы, с которыми можно найти искомую величину
+        unique_combs = get_minimal_sets(variable_bits[var], context)
+        if validate:
+            for comb in unique_combs:
+                if not check(comb, variable_bits[var], context):
+                    print(f'\n{var} не рассчитывается численно по {from_mask(comb)}', end=' ')
         #
 
-        variables_collections[find_element] = (len(unique_combs), unique_combs)
+        variables_collections[var] = (len(unique_combs),
+                                      [tuple(from_mask(comb)) for comb in unique_combs])
         print(time() - start_time)
 
     # Вывод и проверка результатов
@@ -78,22 +66,122 @@ def get_collections(y0_fame: bool):
     if ans == 'no':
         exit()
 
-    # Запись результатов в базу данных
-    for variable in variables_collections:
-        for comb in variables_collections[variable][1]:
-            add_data_to_db(MY_DB, 'variables_collections',
-                           ('variable', 'required_values', 'is_known'),
-                           (variable, ' '.join(str(v) for v in comb), int(y0_fame)))
+    # Запись результатов в базу данных (строки режима y0 заменяются одной транзакцией)
+    rows = [(str(variable), ' '.join(str(v) for v in comb), int(y0_fame))
+            for variable in variables_collections for comb in variables_collections[variable][1]]
+    replace_data_in_db(MY_DB, 'variables_collections', COLUMNS, rows, {'is_known': int(y0_fame)})
+
+    fingerprints = get_fingerprints()
+    replace_data_in_db(MY_DB, FINGERPRINTS_TABLE, ('variable', 'is_known', 'fingerprint'),
+                       [(variable, int(known), fingerprints[(known, variable)])
+                        for known, variable in fingerprints if known == y0_fame],
+                       {'is_known': int(y0_fame)})
     #
 
 
+def get_fingerprints() -> dict:
+    """
+    Функция вычисляет текущие отпечатки подграфов формул всех переменных (см. variable_fingerprint)
+    :return: Словарь вида <(Известность y0, Имя переменной)> = <Отпечаток>
+    """
+
+    fingerprints = {}
+    for y0_fame in (True, False):
+        context = SolverContext(y0_fame)
+        for var in all_variables:
+            fingerprints[(y0_fame, str(var))] = variable_fingerprint(variable_bits[var], context)
+    return fingerprints
+
+
+def collect(y0_fame: bool, variable: str, validate=False) -> (list, list):
+    """
+    Функция находит минимальные наборы одной переменной (выполняется в процессе-обработчике)
+    :param y0_fame: Известность y0
+    :param variable: Имя искомой переменной
+    :param validate: Проверять ли найденные наборы численно (расчетом по best_values)
+    :return: Кортеж из списка строк таблицы variables_collections и списка наборов,
+             не прошедших численную проверку
+    """
+
+    context = SolverContext(y0_fame)
+    bit = variable_bits[symbols_by_name[variable]]
+
+    rows, failed = [], []
+    for comb in get_minimal_sets(bit, context):
+        required_values = ' '.join(str(v) for v in from_mask(comb))
+        rows.append((variable, required_values, int(y0_fame)))
+        if validate and not check(comb, bit, context):
+            failed.append(required_values)
+    return rows, failed
+
+
+def regenerate(workers=None, validate=False, full=False) -> None:
+    """
+    Функция без участия пользователя пересчитывает коллекции переменных для обоих режимов
+    известности y0 параллельно в нескольких процессах. Пересчитываются только переменные,
+    отпечаток подграфа формул которых изменился (строки остальных переменных не трогаются);
+    строки пересчитанных переменных заменяются одной транзакцией
+    :param workers: Количество процессов (по умолчанию количество ядер)
+    :param validate: Проверять ли найденные наборы численно (расчетом по best_values)
+    :param full: Пересчитать все переменные и заменить всю таблицу
+    """
+
+    start = time()
+    stored = {(bool(is_known), variable): fingerprint for variable, is_known, fingerprint
+              in get_data_from_db(MY_DB, FINGERPRINTS_TABLE, 'variable, is_known, fingerprint')}
+    fingerprints = get_fingerprints()
+
+    full = full or not stored
+    tasks = [task for task in fingerprints if full or stored.get(task) != fingerprints[task]]
+    if not tasks:
+        print('Коллекции переменных актуальны')
+        return
+
+    results = {}
+    with ProcessPoolExecutor(workers) as executor:
+        futures = {executor.submit(collect, *task, validate): task for task in tasks}
+        for done, future in enumerate(as_completed(futures), 1):
+            y0_fame, variable = futures[future]
+            results[(y0_fame, variable)] = rows, failed = future.result()
+            print(f'[{done}/{len(tasks)}] {variable} (y0 известна: {y0_fame}): {len(rows)}')
+            for required_values in failed:
+                print(f'    {variable} не рассчитывается численно по {required_values}')
+
+    # Запись строк пересчитанных переменных, затем их отпечатков (если запись прервется между
+    # транзакциями, при следующем запуске эти переменные просто пересчитаются еще раз)
+    rows = [row for task in tasks for row in results[task][0]]  # Порядок не зависит от процессов
+    conditions = None if full else [{'variable': variable, 'is_known': int(y0_fame)}
+                                    for y0_fame, variable in tasks]
+    replace_data_in_db(MY_DB, 'variables_collections', COLUMNS, rows, conditions)
+    replace_data_in_db(MY_DB, FINGERPRINTS_TABLE, ('variable', 'is_known', 'fingerprint'),
+                       [(variable, int(y0_fame), fingerprints[(y0_fame, variable)])
+                        for y0_fame, variable in tasks], conditions)
+    #
+
+    print(f'{len(tasks)} переменных, {len(rows)} строк записано за {time() - start:.2f} с')
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Генерация таблицы variables_collections')
+    parser.add_argument('--batch', action='store_true',
+                        help='пересчитать все коллекции без вопросов (параллельно)')
+    parser.add_argument('--workers', type=int, default=None, help='количество процессов')
+    parser.add_argument('--validate', action='store_true',
+                        help='дополнительно проверить наборы численным расчетом')
+    parser.add_argument('--full', action='store_true',
+                        help='пересчитать все переменные, а не только затронутые изменениями')
+    args = parser.parse_args()
+
+    migrate(MY_DB)  # Таблица отпечатков создается миграцией
+    if args.batch:
+        regenerate(args.workers, args.validate, args.full)
+        exit()
+
     us_ans = input('delete combinations? (yes or no)\n')
     while us_ans not in ('yes', 'no'):
         us_ans = input('is all ok? (yes, no)\n')
     if us_ans == 'no':
         exit()
 
-    delete_data_from_db(MY_DB, 'variables_collections', {})
-    get_collections(True)
-    get_collections(False)
+    get_collections(True, args.validate)
+    get_collections(False, args.validate)
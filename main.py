@@ -19,8 +19,11 @@ from PyQt5.QtCore import QTimer, QSize, Qt
 from resources.ui_files import main_wnd, about_wnd, settings_wnd, about_shot_wnd, save_results
 
 from formulas import *
+from analytic import find_fast
 from constants import *
 from database_requests import *
+from migrations import migrate
+from shot_memo import ShotMemo
 
 from math import sin, cos, radians as rad
 
@@ -180,7 +183,7 @@ class SettingsWindow(QWidget, settings_wnd.Ui_Form):
         self.setupUi(self)
 
         # Получение настроек из бвзы данных #
-        params = {param: value for p_id, param, value in get_data_from_db(MY_DB, 'settings', '*')}
+        params = get_settings_from_db(MY_DB)
 
         # Загрузка настроек
         self.g_dsb.setValue(params['g'])
@@ -379,6 +382,7 @@ class MainWindow(QMainWindow, main_wnd.Ui_MainWindow):
         self.add_btn.setIconSize(QSize(28, 28))
         self.add_btn.clicked.connect(self.add_row)
 
+        self.solver_context = SolverContext(self.var_fame_chb.isChecked())
         self.need_to_update_items = True
         self.table_cbs = []
         self.delete_buttons = []
@@ -521,18 +525,9 @@ class MainWindow(QMainWindow, main_wnd.Ui_MainWindow):
         self.moment_time_dsb.setEnabled(True)
         #
 
-        # Расчет информации о броске
+        # Расчет информации о броске (начальная высота задана явно)
         known_values = {v0: self.v0_dsb.value(), a: self.angle_dsb.value(), y0: self.y0_dsb.value()}
-
-        change_state = False
-        if self.var_fame_chb.isChecked():
-            self.var_fame_chb.setCheckState(0)
-            change_state = True
-
-        find(known_values)
-
-        if change_state:
-            self.var_fame_chb.setCheckState(2)
+        find_fast(known_values, context=SolverContext(y0_known=False))
         #
 
         self.moment_time_dsb.setMaximum(known_values[t])
@@ -613,7 +608,7 @@ class MainWindow(QMainWindow, main_wnd.Ui_MainWindow):
     def check_add_opportunity(self):
         """ Проверка на возможность добавления новой величины """
 
-        free_space = len(name_to_variable) - y0.is_known
+        free_space = len(name_to_variable) - self.solver_context.y0_known
         self.add_btn.setEnabled(self.known_values_table.rowCount() - 1 < free_space)
 
     def update_items(self):
@@ -627,7 +622,7 @@ class MainWindow(QMainWindow, main_wnd.Ui_MainWindow):
         # Получение возможных item-ов
         table_items = [table_cb.currentText() for table_cb in self.table_cbs]
         suitable_items = [item for item in name_to_variable.keys() if item not in table_items]
-        if y0.is_known:
+        if self.solver_context.y0_known:
             suitable_items.remove(variable_to_name[y0])
         #
 
@@ -639,6 +634,28 @@ class MainWindow(QMainWindow, main_wnd.Ui_MainWindow):
         #
 
         self.need_to_update_items = True
+        self.show_missing_hint()
+
+    def show_missing_hint(self):
+        """ Метод показывает в строке состояния, каких величин не хватает для поиска остальных """
+
+        if self.find_type_cb.currentText() != 'Все':
+            self.statusbar.clearMessage()
+            return
+
+        known = [name_to_variable[table_cb.currentText()] for table_cb in self.table_cbs
+                 if table_cb.currentText() in name_to_variable]
+        missing = get_missing_sets(known, self.solver_context)
+        if not missing:
+            self.statusbar.showMessage('Известных величин достаточно для поиска всех остальных')
+            return
+
+        hints = []
+        for var, extra_sets in missing.items():
+            options = [' + '.join(map(str, extra)) for extra in extra_sets[:3]]
+            options += ['...'] if len(extra_sets) > 3 else []
+            hints.append(f'{var}: {" или ".join(options)}')
+        self.statusbar.showMessage(f'Не хватает для поиска - {"; ".join(hints)}')
 
     def find_values(self):
         """ Функция "ищет" необходимые величины """
@@ -664,18 +681,18 @@ class MainWindow(QMainWindow, main_wnd.Ui_MainWindow):
                 return
         #
 
-        # Поиск всевозможных величин по известным переменным
+        # Поиск всевозможных (или только целевой) величин по известным переменным
         try:
             known_values = {key: variables[key] for key in
                             filter(lambda key: variables[key] is not None, variables)}
-            known_values, formulas = find(known_values)
 
-            # Сортировка найденных значений по целевой переменной
-            if self.find_type_cb.currentText() != 'Все':
+            if self.find_type_cb.currentText() == 'Все':
+                known_values, formulas = find_fast(known_values, context=self.solver_context,
+                                                   with_formulas=True)
+            else:
                 target_variable = name_to_variable[self.find_type_cb.currentText()]
-                formulas = {key: formulas[key] for key in
-                            sorted(formulas, key=lambda variable: variable != target_variable)}
-            #
+                known_values, formulas = find_fast(known_values, targets=[target_variable],
+                                                   context=self.solver_context, with_formulas=True)
 
             info = [
                 (variable_to_name[key], f'{key} = {formulas[key]}',
@@ -730,8 +747,6 @@ class MainWindow(QMainWindow, main_wnd.Ui_MainWindow):
     def change_y0_fame(self):
         """ Метод обновляет известность y0 и обновляет таблицу """
 
-        y0.is_known = self.var_fame_chb.isChecked()
-
         self.change_formulas()
 
         if self.find_type_cb.currentText() == variable_to_name[y0]:
@@ -741,7 +756,7 @@ class MainWindow(QMainWindow, main_wnd.Ui_MainWindow):
         if self.find_type_cb.currentText() != 'Все':  # Не обновляет таблицу если выбран поиск всего
             self.change_table()
         else:  # Регулирование доступности указывания начальной высоты
-            if y0.is_known:
+            if self.solver_context.y0_known:
                 start_height = variable_to_name[y0]
                 for i in range(1, self.known_values_table.rowCount()):
                     if self.known_values_table.cellWidget(i, 0).currentText() == start_height:
@@ -752,20 +767,9 @@ class MainWindow(QMainWindow, main_wnd.Ui_MainWindow):
         self.check_add_opportunity()
 
     def change_formulas(self):
-        """ Метод изменяет формулы расчетов некоторых величин в зависимости от известности y0 """
-
-        if self.var_fame_chb.isChecked():
-            index_s = all_form.index(s_v0_a_t)
-            index_vmx = all_form.index(vmx_v0_a_t)
-
-            all_form[index_s] = s_v0_a_y00
-            all_form[index_vmx] = vmx_v0_y00
-        else:
-            index_s = all_form.index(s_v0_a_y00)
-            index_vmx = all_form.index(vmx_v0_y00)
+        """ Метод меняет контекст решения (известность y0 и набор формул) по состоянию флажка """
 
-            all_form[index_s] = s_v0_a_t
-            all_form[index_vmx] = vmx_v0_a_t
+        self.solver_context = SolverContext(self.var_fame_chb.isChecked())
 
     def change_table(self):
         """ Метод меняет отображение таблицы в зависимости от того, то хочет найти пользователь """
@@ -776,12 +780,13 @@ class MainWindow(QMainWindow, main_wnd.Ui_MainWindow):
             self.add_btn.setEnabled(True)
             self.table_cbs.clear()
             self.delete_buttons.clear()
+            self.show_missing_hint()
             return
+        self.statusbar.clearMessage()  # Подсказка нужна только при поиске всех величин
         #
 
         # Если выбран поиск y0 искусственно снимаем известность y0
-        if self.find_type_cb.currentText() == variable_to_name[y0] and y0.is_known:
-            y0.is_known = False
+        if self.find_type_cb.currentText() == variable_to_name[y0] and self.solver_context.y0_known:
             self.var_fame_chb.disconnect()
             self.var_fame_chb.setCheckState(0)
             self.change_formulas()
@@ -791,15 +796,14 @@ class MainWindow(QMainWindow, main_wnd.Ui_MainWindow):
         # Загрузка наборов переменных для поиска целевой переменной
         self.add_btn.setEnabled(False)
         variable = name_to_variable[self.find_type_cb.currentText()]
-        combinations = get_data_from_db(MY_DB, 'variables_collections', 'required_values',
-                                        {'variable': [str(variable)],
-                                         'is_known': [str(int(y0.is_known))]})
+        combinations = get_collections_from_db(MY_DB, str(variable),
+                                               int(self.solver_context.y0_known))
         #
 
         # Добавление каждого набора в таблицу
         self.combinations = []
         for combination in combinations:
-            values = [str_variable_to_name[var] for var in combination[0].split()]
+            values = [str_variable_to_name[var] for var in combination.split()]
             self.combinations.append(values)
 
             rows = self.known_values_table.rowCount()
@@ -989,7 +993,10 @@ def except_hook(cls, exception, traceback):
 if __name__ == '__main__':
     app = QApplication(sys.argv)
 
+    migrate(MY_DB)  # Обновление схемы базы данных
     update_constants()  # Обновление констант
+    set_shot_memo(ShotMemo(MY_DB))  # Решенные ранее броски берутся из базы данных
+    precompute_plans()  # Построение планов решения для всех наборов известных величин
 
     # Создание главного окна приложения
     wnd = MainWindow()
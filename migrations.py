@@ -0,0 +1,80 @@
+from database_requests import *
+import database_requests
+
+
+# Миграции схемы базы данных: (версия, описание, список запросов).
+# Миграции применяются по возрастанию версии, каждая - в своей транзакции; уже примененные
+# версии записаны в таблице schema_version. Новые миграции добавляются только в конец
+MIGRATIONS = [
+    (1, 'Индекс variables_collections по (variable, is_known)', [
+        "CREATE INDEX IF NOT EXISTS variables_collections_variable_is_known "
+        "ON variables_collections(variable, is_known)"
+    ]),
+    (2, 'Таблица отпечатков подграфов формул collections_fingerprints', [
+        "CREATE TABLE IF NOT EXISTS collections_fingerprints ("
+        "variable VARCHAR (8) NOT NULL, is_known INTEGER NOT NULL, "
+        "fingerprint VARCHAR (64) NOT NULL, PRIMARY KEY (variable, is_known))"
+    ]),
+    (3, 'Постоянный кэш решенных бросков shot_memo', [
+        "CREATE TABLE IF NOT EXISTS shot_memo ("
+        "id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT, key VARCHAR NOT NULL, "
+        "is_known INTEGER NOT NULL, g REAL NOT NULL, solution VARCHAR NOT NULL, "
+        "last_used REAL NOT NULL)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS shot_memo_key ON shot_memo(key, is_known, g)",
+        "CREATE INDEX IF NOT EXISTS shot_memo_last_used ON shot_memo(last_used)"
+    ]),
+]
+#
+
+
+def get_schema_version(db: str) -> int:
+    """
+    Функция возвращает версию схемы базы данных (0 - миграции не применялись)
+    :param db: Используемая база данных
+    :return: Номер последней примененной миграции
+    """
+
+    with transaction(db) as con:
+        run_query(con, "CREATE TABLE IF NOT EXISTS schema_version ("
+                       "version INTEGER NOT NULL PRIMARY KEY, description VARCHAR NOT NULL, "
+                       "applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)")
+        (version,), = run_query(con, "SELECT COALESCE(MAX(version), 0) FROM schema_version",
+                                fetch=True)
+    return version
+
+
+def migrate(db: str) -> int:
+    """
+    Функция применяет к базе данных все еще не примененные миграции
+    :param db: Используемая база данных
+    :return: Количество примененных миграций
+    """
+
+    version = get_schema_version(db)
+    if version > MIGRATIONS[-1][0]:
+        raise RuntimeError(f'Версия схемы базы данных {db} ({version}) новее, чем известная '
+                           f'программе ({MIGRATIONS[-1][0]})')
+
+    applied = 0
+    for migration_version, description, requests in MIGRATIONS:
+        if migration_version <= version:
+            continue
+
+        if database_requests.query_log:  # Журнал мог быть включен после импорта
+            write_query_log(f'migration {migration_version}: {description}')
+        with transaction(db) as con:  # Запросы миграции и запись версии фиксируются вместе
+            for request in requests:
+                run_query(con, request)
+            run_query(con, "INSERT INTO schema_version(version, description) VALUES (?, ?)",
+                      (migration_version, description))
+        applied += 1
+
+    if applied:
+        invalidate_cache(db)
+    return applied
+
+
+if __name__ == '__main__':
+    from constants import MY_DB
+
+    print(f'Применено миграций: {migrate(MY_DB)}, версия схемы: {get_schema_version(MY_DB)}')
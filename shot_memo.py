@@ -0,0 +1,85 @@
+from time import time
+import json
+
+from formulas import *
+from database_requests import *
+
+
+class ShotMemo:
+    """
+    Класс постоянного кэша решенных бросков (таблица shot_memo, см. migrations).
+    Ключ (см. formulas.solution_key) - хэш формул, известные значения, округленные до
+    CONSTANTS['memo_precision'] знаков, искомые переменные, известность y0 и g; после изменения
+    формул прежние решения не используются. Хранятся найденные значения и формулы (sym.srepr).
+    Таблица ограничивается CONSTANTS['memo_size'] строками: удаляются давно не использованные
+    """
+
+    PRUNE_EVERY = 100  # Проверка размера таблицы после каждых PRUNE_EVERY записей
+
+    def __init__(self, db: str):
+        """ :param db: Используемая база данных """
+
+        self.db = db
+        self._puts = 0
+
+    def get(self, key: tuple):
+        """
+        Метод ищет решение в кэше и отмечает его использование
+        :param key: Ключ кэша (см. formulas.solution_key)
+        :return: Кортеж словарей (значения, формулы) или None, если решения нет
+        """
+
+        with transaction(self.db) as con:
+            rows = run_query(con, "SELECT id, solution FROM shot_memo "
+                                  "WHERE key = ? AND is_known = ? AND g = ?", key, fetch=True)
+            if not rows:
+                return None
+            memo_id, solution = rows[0]
+            run_query(con, "UPDATE shot_memo SET last_used = ? WHERE id = ?", (time(), memo_id))
+
+        solution = json.loads(solution)
+        return ({symbols_by_name[var]: value for var, value in solution['values'].items()},
+                {symbols_by_name[var]: parse_expression(formula)
+                 for var, formula in solution['formulas'].items()})
+
+    def put(self, key: tuple, values: dict, formulas: dict) -> None:
+        """
+        Метод сохраняет решение в кэш
+        :param key: Ключ кэша (см. formulas.solution_key)
+        :param values: Словарь известных и найденных значений
+        :param formulas: Словарь формул найденных величин
+        """
+
+        solution = json.dumps({
+            'values': {str(var): float(value) for var, value in values.items()},
+            'formulas': {str(var): sym.srepr(formula) for var, formula in formulas.items()}
+        })
+        with transaction(self.db) as con:
+            run_query(con, "INSERT OR REPLACE INTO shot_memo(key, is_known, g, solution, "
+                           "last_used) VALUES (?, ?, ?, ?, ?)", (*key, solution, time()))
+
+        self._puts += 1
+        if self._puts % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self, size=None) -> int:
+        """
+        Метод удаляет давно не использованные решения сверх размера кэша
+        :param size: Наибольшее количество решений (по умолчанию CONSTANTS['memo_size'])
+        :return: Количество удаленных решений
+        """
+
+        size = int(CONSTANTS['memo_size'] if size is None else size)
+        with transaction(self.db) as con:
+            (count,), = run_query(con, "SELECT COUNT(*) FROM shot_memo", fetch=True)
+            if count <= size:
+                return 0
+            run_query(con, "DELETE FROM shot_memo WHERE id IN "
+                           "(SELECT id FROM shot_memo ORDER BY last_used LIMIT ?)", (count - size,))
+        return count - size
+
+    def clear(self) -> None:
+        """ Метод удаляет все решения """
+
+        with transaction(self.db) as con:
+            run_query(con, "DELETE FROM shot_memo")